@@ -0,0 +1,135 @@
+"""
+Compare the sync and async public views under Granian ASGI.
+
+Starts the same Granian command the Dockerfile uses once per variant, drives
+each page with N keep-alive connections for a fixed duration, and prints
+requests/sec and latency percentiles. Needs a reachable, seeded database
+(``python manage.py seed_data``) configured through the usual DB_* variables.
+
+    python -m benchmarks.async_views --concurrency 256 --duration 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import time
+
+VARIANTS = {
+    "sync": "benchmarks.urls_sync",
+    "async": "benchmarks.urls_async",
+}
+
+PATHS = ["/", "/projects/", "/projects/?category=WEB_DEV"]
+
+
+async def _request(reader, writer, host: str, path: str) -> int:
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _worker(host, port, path, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status = await _request(reader, writer, host, path)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _load(host, port, path, concurrency, duration) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(
+            _worker(host, port, path, deadline, latencies, errors)
+            for _ in range(concurrency)
+        )
+    )
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / duration,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+        "errors": len(errors),
+    }
+
+
+def _start_server(
+    variant: str, port: int, workers: int, extra_env: dict[str, str] | None = None
+) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+        "BENCH_URLCONF": VARIANTS[variant],
+        **(extra_env or {}),
+    }
+    command = [
+        "granian",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--interface", "asgi",
+        "--workers", str(workers),
+        "core.asgi:application",
+    ]  # fmt: skip
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+
+
+async def _wait_until_ready(host: str, port: int) -> None:
+    for _ in range(100):
+        try:
+            _reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        return
+    raise RuntimeError("Granian did not start")
+
+
+async def main(args: argparse.Namespace) -> None:
+    host = "127.0.0.1"
+    print(
+        f"{'variant':8} {'path':30} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'errors':>7}"
+    )
+    for variant in VARIANTS:
+        server = _start_server(variant, args.port, args.workers)
+        try:
+            await _wait_until_ready(host, args.port)
+            for path in PATHS:
+                # Warm templates, URL resolver and DB connections first.
+                await _load(host, args.port, path, args.concurrency, 1)
+                result = await _load(
+                    host, args.port, path, args.concurrency, args.duration
+                )
+                print(
+                    f"{variant:8} {path:30} {result['rps']:10.1f} "
+                    f"{result['p50']:9.1f} {result['p99']:9.1f} {result['errors']:7}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+
+from project.listing import rebuild_listing_snapshots
+from project.models import PROJECT_CATEGORIES, Project, ProjectTag, Tag
+from project.text import render_project_text
+
+CATALOGUE_SIZES = (10, 1_000, 50_000)
+
+TAG_NAMES = ["PYTHON", "DJANGO", "POSTGRESQL", "GOLANG", "REDIS", "DOCKER"]
+
+PARAGRAPH = "Body text for the benchmark catalogue, long enough to wrap.\n" * 6
+
+
+def seed_catalogue(count: int) -> None:
+    """Bulk insert ``count`` projects with tags, rendered text and snapshots."""
+    categories = list(PROJECT_CATEGORIES)
+    Tag.objects.bulk_create([Tag(name=name) for name in TAG_NAMES])
+    tags = {tag.name: tag for tag in Tag.objects.all()}
+    for start in range(0, count, 5_000):
+        projects = []
+        for n in range(start, min(start + 5_000, count)):
+            names = [TAG_NAMES[(n + offset) % len(TAG_NAMES)] for offset in range(3)]
+            project = Project(
+                title=f"Project {n}",
+                category=categories[n % len(categories)],
+                short_summary=f"Summary of project {n}",
+                role="Engineer",
+                year=2000 + n % 25,
+                stack=" ".join(names),
+                challenge=PARAGRAPH,
+                key_features="One\nTwo\nThree",
+                description="\n\n".join([PARAGRAPH] * 3),
+            )
+            # bulk_create skips the save signals that normally do this.
+            render_project_text(project)
+            projects.append(project)
+        Project.objects.bulk_create(projects)
+        ProjectTag.objects.bulk_create(
+            ProjectTag(
+                project=project, tag=tags[name], position=position, year=project.year
+            )
+            for project in projects
+            for position, name in enumerate(project.stack.split())
+        )
+    rebuild_listing_snapshots()
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE project_project, project_projecttag")
+
+
+@pytest.fixture(scope="module", params=CATALOGUE_SIZES, ids=lambda n: f"{n}rows")
+def catalogue(request, django_db_setup, django_db_blocker):
+    """A committed catalogue shared by every benchmark of one size."""
+    with django_db_blocker.unblock():
+        seed_catalogue(request.param)
+        yield request.param
+        # A model delete would rebuild the snapshots once per project.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "TRUNCATE project_project, project_projecttag, project_tag,"
+                " project_listingsnapshot RESTART IDENTITY CASCADE"
+            )
@@ -0,0 +1,110 @@
+"""
+Compare persistent connections with the psycopg pool under Granian ASGI.
+
+Serves the async views once with ``DB_POOL=False`` (a connection per thread,
+kept for ``DB_CONN_MAX_AGE``) and once with ``DB_POOL=True``, drives pages
+that query on every request, and prints requests/sec, latency percentiles,
+the peak number of Postgres client connections and how many distinct
+backends served the run. Needs a reachable, seeded database
+(``python manage.py seed_data``) configured through the usual DB_* variables.
+
+    python -m benchmarks.db_pool --concurrency 64 --duration 20
+"""
+
+import argparse
+import asyncio
+import os
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+
+from benchmarks.async_views import _load, _start_server, _wait_until_ready
+
+MODES = {
+    "persistent": {"DB_POOL": "False"},
+    "pool": {"DB_POOL": "True"},
+}
+
+# Neither has a page cache or a snapshot in front in the benchmark URLconf;
+# {pk} is the first project in the database.
+PATHS = ["/projects/{pk}/", "/projects/?tag=PYTHON"]
+
+_CLIENT_BACKENDS = """
+    SELECT pid FROM pg_stat_activity
+    WHERE datname = current_database()
+      AND backend_type = 'client backend'
+      AND pid <> pg_backend_pid()
+"""
+
+
+def _conninfo() -> str:
+    return make_conninfo(
+        dbname=os.getenv("DB_NAME", "portofolio"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432"),
+    )
+
+
+async def _watch_backends(
+    connection: psycopg.AsyncConnection, stop: asyncio.Event
+) -> tuple[int, int]:
+    """Sample client backends until ``stop``; returns (peak, distinct pids)."""
+    peak = 0
+    seen: set[int] = set()
+    while not stop.is_set():
+        cursor = await connection.execute(_CLIENT_BACKENDS)
+        pids = {pid for (pid,) in await cursor.fetchall()}
+        peak = max(peak, len(pids))
+        seen |= pids
+        try:
+            await asyncio.wait_for(stop.wait(), 0.05)
+        except TimeoutError:
+            pass
+    return peak, len(seen)
+
+
+async def main(args: argparse.Namespace) -> None:
+    host = "127.0.0.1"
+    # Connected before any load, so it still gets a slot if the server runs
+    # Postgres out of connections.
+    monitor = await psycopg.AsyncConnection.connect(_conninfo(), autocommit=True)
+    cursor = await monitor.execute("SELECT min(id) FROM project_project")
+    (pk,) = await cursor.fetchone() or (None,)
+    paths = [path.format(pk=pk) for path in PATHS]
+    print(
+        f"{'mode':11} {'path':24} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'errors':>7} {'peak conns':>11} {'backends':>9}"
+    )
+    for mode, env in MODES.items():
+        server = _start_server("async", args.port, args.workers, env)
+        try:
+            await _wait_until_ready(host, args.port)
+            for path in paths:
+                await _load(host, args.port, path, args.concurrency, 1)
+                stop = asyncio.Event()
+                watcher = asyncio.create_task(_watch_backends(monitor, stop))
+                result = await _load(
+                    host, args.port, path, args.concurrency, args.duration
+                )
+                stop.set()
+                peak, backends = await watcher
+                print(
+                    f"{mode:11} {path:24} {result['rps']:10.1f} "
+                    f"{result['p50']:9.1f} {result['p99']:9.1f} "
+                    f"{result['errors']:7} {peak:11} {backends:9}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+    await monitor.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
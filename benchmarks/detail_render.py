@@ -0,0 +1,69 @@
+"""
+Time the project detail template with the long-form fields rendered per
+request (``|linebreaks``, as before) and with the stored ``*_html`` columns.
+
+Renders in-process from an unsaved project, so no database is needed.
+
+    python -m benchmarks.detail_render --number 2000
+"""
+
+import argparse
+import os
+import timeit
+from functools import partial
+
+FIELDS = ("challenge", "key_features", "description")
+
+
+def main(args: argparse.Namespace) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+
+    from django.template import engines
+    from django.template.loader import get_template
+    from django.test import RequestFactory
+
+    from project.models import Project
+    from project.text import render_project_text
+
+    paragraph = "Line of project text with <tags> & entities to escape.\n" * 8
+    project = Project(
+        pk=1,
+        title="Benchmark",
+        category="WEB_DEV",
+        short_summary="Summary",
+        role="Engineer",
+        year=2024,
+        stack="PYTHON DJANGO POSTGRESQL",
+        **{field: "\n\n".join([paragraph] * args.paragraphs) for field in FIELDS},
+    )
+    render_project_text(project)
+    # The tag list reads the prefetch cache; keep it empty and query-free.
+    project._prefetched_objects_cache = {"project_tags": Project.objects.none()}
+
+    stored = get_template("pages/project_detail.html")
+    source = stored.template.source
+    for field in FIELDS:
+        source = source.replace(
+            f"{{{{ project.{field}_html|safe }}}}",
+            f"{{{{ project.{field}|linebreaks }}}}",
+        )
+    per_request = engines["django"].from_string(source)
+
+    request = RequestFactory().get("/projects/1/")
+    context = {"project": project}
+    print(f"{'variant':12} {'ms/render':>10}")
+    for name, template in (("linebreaks", per_request), ("stored", stored)):
+        seconds = timeit.timeit(
+            partial(template.render, context, request), number=args.number
+        )
+        print(f"{name:12} {seconds / args.number * 1000:10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--paragraphs", type=int, default=6)
+    main(parser.parse_args())
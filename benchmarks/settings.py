@@ -0,0 +1,15 @@
+import os
+
+from core.settings import *
+
+# Set by benchmarks.async_views for each run. Both URLconfs route to the bare
+# views, without the page cache or conditional GET decorators in front.
+ROOT_URLCONF = os.environ.get("BENCH_URLCONF", "benchmarks.urls_async")
+
+ALLOWED_HOSTS = ["*"]
+
+# The server runs from the source tree, without a collectstatic manifest.
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
@@ -0,0 +1,138 @@
+"""Sync twins of the public views, kept as the baseline for the async port.
+
+Same queries, context and templates as ``project.views``, run through the
+sync ORM and without the page cache or conditional GET in front. The home
+page reads its featured cards through an in-process cache like
+``project.listing.featured_projects``, and first listing pages are served
+from the same ListingSnapshot rows.
+"""
+
+import time
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.shortcuts import get_object_or_404, render
+
+from project.listing import (
+    FeaturedProjects,
+    ProjectCard,
+    build_featured_projects,
+    is_current_snapshot,
+    is_grid_fragment,
+    projects_json,
+    rebuild_listing_snapshot,
+    snapshot_cards,
+    snapshot_category,
+    snapshot_json,
+)
+from project.models import PROJECT_CATEGORIES, ListingSnapshot, Project, normalize_tag
+from project.pagination import (
+    NEXT,
+    PREVIOUS,
+    InvalidCursor,
+    encode_cursor,
+    page_queryset,
+)
+from project.text import TEXT_FIELDS
+
+# The benchmark makes no writes, so nothing needs to drop this before it
+# expires.
+_featured: FeaturedProjects | None = None
+
+
+def featured_projects() -> FeaturedProjects:
+    global _featured
+    if _featured is None or _featured.expires <= time.monotonic():
+        _featured = build_featured_projects(
+            [ProjectCard.from_row(row) for row in Project.objects.featured().listing()]
+        )
+    return _featured
+
+
+def listing_snapshot(category: str) -> ListingSnapshot:
+    snapshot = ListingSnapshot.objects.filter(category=category).first()
+    if not is_current_snapshot(snapshot):
+        snapshot = rebuild_listing_snapshot(category)
+    return snapshot
+
+
+def home(request: HttpRequest) -> HttpResponse:
+    tech_stack = [
+        "GOLANG",
+        "PYTHON",
+        "POSTGRESQL",
+        "DOCKER",
+        "REDIS",
+        "SYSTEM DESIGN",
+        "CI/CD",
+        "PHP",
+    ]
+    featured = featured_projects()
+
+    context = {
+        "tech_stack": tech_stack,
+        "featured_projects": featured.cards,
+    }
+    return render(request, "pages/home.html", context)
+
+
+def project_list(request: HttpRequest) -> HttpResponse:
+    category_filter = request.GET.get("category")
+    tag_filter = request.GET.get("tag")
+    if category := snapshot_category(request):
+        snapshot = listing_snapshot(category)
+        projects = snapshot_cards(snapshot)
+        data = snapshot_json(snapshot)
+        next_cursor, previous_cursor = snapshot.next_cursor or None, None
+    else:
+        page_size = settings.PROJECTS_PAGE_SIZE
+        try:
+            page, direction = page_queryset(
+                Project.objects.for_category(category_filter)
+                .with_tag(tag_filter)
+                .listing(),
+                request.GET.get("cursor"),
+                page_size,
+            )
+        except InvalidCursor:
+            raise Http404("Invalid page cursor")
+        rows = list(page)
+        more = len(rows) > page_size
+        if direction == PREVIOUS:
+            rows = rows[:page_size][::-1]
+            has_next, has_previous = True, more
+        else:
+            rows = rows[:page_size]
+            has_next, has_previous = more, direction == NEXT
+        projects = [ProjectCard.from_row(row) for row in rows]
+        data = projects_json(projects)
+        next_cursor = (
+            encode_cursor(projects[-1], NEXT) if projects and has_next else None
+        )
+        previous_cursor = (
+            encode_cursor(projects[0], PREVIOUS) if projects and has_previous else None
+        )
+
+    context = {
+        "projects": projects,
+        "current_filter": category_filter or "all",
+        "current_tag": normalize_tag(tag_filter) if tag_filter else None,
+        "next_cursor": next_cursor,
+        "previous_cursor": previous_cursor,
+    }
+    if is_grid_fragment(request):
+        return render(request, "components/project_grid.html", context)
+    context["projects_json"] = data
+    context["categories"] = PROJECT_CATEGORIES
+    return render(request, "pages/projects.html", context)
+
+
+def project_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    project = get_object_or_404(
+        Project.objects.with_tags().defer(*TEXT_FIELDS, "search_vector"), pk=pk
+    )
+
+    context = {
+        "project": project,
+    }
+    return render(request, "pages/project_detail.html", context)
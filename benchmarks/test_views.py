@@ -0,0 +1,100 @@
+"""
+Cost of the public views at 10, 1k and 50k projects, checked against budgets.
+
+Each view is requested through the test client with the page cache empty, so
+every measurement is a full cache miss. Budgets in ``budgets.json`` are per
+view, set a little above what the 50k catalogue measured, and the same budget
+applies at every size: a view that gets more expensive as the table grows,
+such as an N+1 or an unbounded listing, fails at the larger sizes first.
+
+    pytest benchmarks
+"""
+
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from project.models import Project
+
+BUDGETS = json.loads((Path(__file__).parent / "budgets.json").read_text())
+
+TIMED_RUNS = 5
+
+CASES = {
+    "home": lambda: (reverse("home"), {}),
+    "project_list": lambda: (reverse("projects"), {}),
+    "project_list_category": lambda: (reverse("projects"), {"category": "WEB_DEV"}),
+    "project_list_tag": lambda: (reverse("projects"), {"tag": "PYTHON"}),
+    "project_detail": lambda: (
+        reverse("project_detail", kwargs={"pk": Project.objects.latest("id").pk}),
+        {},
+    ),
+}
+
+
+@dataclass
+class Measurement:
+    ms: float
+    queries: int
+    bytes: int
+    peak_kib: float
+
+
+def _get(client, url, params):
+    cache.clear()
+    response = client.get(url, params)
+    assert response.status_code == 200
+    return response
+
+
+def measure(client, url: str, params: dict) -> Measurement:
+    _get(client, url, params)  # Warm templates, URL resolver and connection.
+
+    timings = []
+    for _ in range(TIMED_RUNS):
+        started = time.perf_counter()
+        _get(client, url, params)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = _get(client, url, params)
+    # Read now: the next request clears the connection's query log.
+    query_count = len(queries)
+
+    tracemalloc.start()
+    try:
+        _get(client, url, params)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        ms=statistics.median(timings),
+        queries=query_count,
+        bytes=len(response.content),
+        peak_kib=peak / 1024,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("case", CASES)
+def test_view_within_budget(client, catalogue, case):
+    url, params = CASES[case]()
+    result = measure(client, url, params)
+    budget = BUDGETS[case]
+
+    over = {
+        metric: (getattr(result, metric), limit)
+        for metric, limit in budget.items()
+        if getattr(result, metric) > limit
+    }
+    assert not over, f"{case} at {catalogue} rows over budget: {over}"
@@ -0,0 +1,13 @@
+from inspect import unwrap
+
+from django.urls import path
+
+from project import views
+
+urlpatterns = [
+    path("", unwrap(views.home), name="home"),
+    path("projects/", unwrap(views.project_list), name="projects"),
+    path("projects/<int:pk>/", unwrap(views.project_detail), name="project_detail"),
+    # Only reversed by the navbar; not part of the comparison.
+    path("search/", views.project_search, name="search"),
+]
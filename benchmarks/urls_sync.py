@@ -0,0 +1,12 @@
+from django.urls import path
+
+from benchmarks import sync_views
+from project import views
+
+urlpatterns = [
+    path("", sync_views.home, name="home"),
+    path("projects/", sync_views.project_list, name="projects"),
+    path("projects/<int:pk>/", sync_views.project_detail, name="project_detail"),
+    # Only reversed by the navbar; not part of the comparison.
+    path("search/", views.project_search, name="search"),
+]
@@ -1,6 +1,41 @@
+from io import BytesIO
+
 import pytest
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from project.models import Project
+from django.db import connection
+from PIL import Image
+
+from project.listing import forget_featured_projects
+from project.models import PROJECT_CATEGORIES, Project, ProjectTag, Tag
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty page and featured-project caches."""
+    cache.clear()
+    forget_featured_projects()
+    yield
+    cache.clear()
+    forget_featured_projects()
+
+
+@pytest.fixture(autouse=True)
+def static_storage(settings):
+    """Resolve {% static %} without the manifest collectstatic writes."""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Keep uploads and generated image variants out of the repository."""
+    settings.MEDIA_ROOT = tmp_path / "media"
+    return settings.MEDIA_ROOT
 
 
 @pytest.fixture
@@ -13,6 +48,18 @@ def sample_image():
     )
 
 
+@pytest.fixture
+def png_image():
+    """Create a real 1600x900 PNG upload."""
+    buffer = BytesIO()
+    Image.new("RGB", (1600, 900), "#CC4400").save(buffer, "PNG")
+    return SimpleUploadedFile(
+        name="real_image.png",
+        content=buffer.getvalue(),
+        content_type="image/png",
+    )
+
+
 @pytest.fixture
 def create_project(db, sample_image):
     """Factory fixture to create projects."""
@@ -37,6 +84,43 @@ def create_project(db, sample_image):
     return _create_project
 
 
+@pytest.fixture
+def large_catalogue(db):
+    """Bulk insert 20k projects spread over categories and years, then ANALYZE.
+
+    Every project is tagged PYTHON, the worst case for a tag page.
+    """
+    categories = list(PROJECT_CATEGORIES)
+    projects = Project.objects.bulk_create(
+        [
+            Project(
+                title=f"Project {n}",
+                category=categories[n % len(categories)],
+                short_summary="Summary",
+                role="Developer",
+                year=2000 + n % 25,
+                stack="PYTHON",
+                challenge="Challenge",
+                key_features="Features",
+                description="Description",
+                image="projects/placeholder.jpg",
+            )
+            for n in range(20_000)
+        ],
+        batch_size=2_000,
+    )
+    tag = Tag.objects.create(name="PYTHON")
+    ProjectTag.objects.bulk_create(
+        (
+            ProjectTag(project=project, tag=tag, year=project.year)
+            for project in projects
+        ),
+        batch_size=2_000,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE project_project, project_projecttag")
+
+
 @pytest.fixture
 def web_dev_project(create_project):
     """Create a web development project."""
@@ -0,0 +1,245 @@
+"""
+collectstatic-time optimizations for stylesheets.
+
+``OptimizedStaticFilesStorage`` minifies every collected ``.css`` file and,
+for the files listed in ``PURGE_CSS_FILES``, first drops the rules whose
+class selectors name a class that appears nowhere under
+``PURGE_CSS_CONTENT``. WhiteNoise's manifest storage then hashes the result
+into the file name and writes ``.gz`` and ``.br`` siblings, so the middleware
+can serve every asset as immutable without compressing at request time.
+
+The CSS handling is deliberately shallow: it understands strings, comments,
+blocks and selector lists, which is all minified Tailwind output and the
+admin stylesheets need, and leaves everything else byte for byte.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Groups whose rules are purged one by one; other at-rules (@font-face,
+# @keyframes, @property, ...) are kept whole.
+_GROUPING_RULES = {"media", "supports", "layer", "container", "scope"}
+
+# Template, Python and JavaScript text is split on whitespace, quotes and
+# markup delimiters; whatever is left may be a class name.
+_CANDIDATE = re.compile(r"[^\s\"'`<>={}]+")
+_CONTENT_SUFFIXES = {".html", ".txt", ".py", ".js"}
+
+_ESCAPE = r"\\(?:[0-9a-fA-F]{1,6}\s?|.)"
+_CLASS = re.compile(rf"\.((?:{_ESCAPE}|[\w-])+)")
+_ATTRIBUTE = re.compile(r"(?<!\\)\[[^\]]*(?<!\\)\]")
+# An unused class inside :not() makes the selector match more, not less.
+_NOT = re.compile(r":not\([^()]*\)")
+
+
+def _unescape(name: str) -> str:
+    def replace(match: re.Match) -> str:
+        escaped = match.group()[1:]
+        if re.fullmatch(r"[0-9a-fA-F]{1,6}\s?", escaped):
+            return chr(int(escaped.strip(), 16))
+        return escaped
+
+    return re.sub(_ESCAPE, replace, name)
+
+
+def _skip_string(css: str, start: int) -> int:
+    """Index just past the string literal opening at ``start``."""
+    quote = css[start]
+    i = start + 1
+    while i < len(css):
+        if css[i] == "\\":
+            i += 2
+        elif css[i] == quote:
+            return i + 1
+        else:
+            i += 1
+    return len(css)
+
+
+def _skip_comment(css: str, start: int) -> int:
+    end = css.find("*/", start + 2)
+    return len(css) if end == -1 else end + 2
+
+
+def _rules(css: str) -> Iterator[tuple[str, str | None]]:
+    """Split ``css`` into top-level ``(prelude, block body)`` pairs.
+
+    Statements such as ``@import ...;`` and comments come with a ``None``
+    body; a comment's prelude is the comment itself.
+    """
+    start = i = 0
+    depth = 0
+    body_start = 0
+    while i < len(css):
+        char = css[i]
+        if char in "\"'":
+            i = _skip_string(css, i)
+            continue
+        if css.startswith("/*", i):
+            end = _skip_comment(css, i)
+            if depth == 0:
+                if prelude := css[start:i].strip():
+                    yield prelude, None
+                yield css[i:end], None
+                start = end
+            i = end
+            continue
+        if char == "{":
+            if depth == 0:
+                body_start = i + 1
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield css[start : body_start - 1].strip(), css[body_start:i]
+                start = i + 1
+        elif char == ";" and depth == 0:
+            if prelude := css[start:i].strip():
+                yield prelude, None
+            start = i + 1
+        i += 1
+    if prelude := css[start:].strip():
+        yield prelude, None
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    """Split a selector list on the commas outside parentheses and brackets."""
+    selectors = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(prelude):
+        char = prelude[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char in "\"'":
+            i = _skip_string(prelude, i)
+            continue
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(prelude[start:i])
+            start = i + 1
+        i += 1
+    selectors.append(prelude[start:])
+    return selectors
+
+
+def selector_classes(selector: str) -> set[str]:
+    """The class names ``selector`` needs on some element to match."""
+    selector = _NOT.sub("", _ATTRIBUTE.sub("", selector))
+    return {_unescape(name) for name in _CLASS.findall(selector)}
+
+
+def content_classes(paths: Iterable[Path]) -> set[str]:
+    """Every token under ``paths`` that could be a class name."""
+    tokens = set()
+    for root in paths:
+        files = [root] if root.is_file() else root.rglob("*")
+        for path in files:
+            if path.suffix not in _CONTENT_SUFFIXES or not path.is_file():
+                continue
+            for token in _CANDIDATE.findall(path.read_text(errors="ignore")):
+                tokens.add(token)
+                tokens.add(token.strip(":;,.()[]%"))
+    return tokens
+
+
+def purge_css(css: str, used: set[str]) -> str:
+    """Drop the selectors of ``css`` that need a class missing from ``used``.
+
+    Rules left without selectors go, and so do groups left without rules.
+    """
+    out = []
+    for prelude, body in _rules(css):
+        if body is None:
+            out.append(prelude if prelude.startswith("/*") else f"{prelude};")
+            continue
+        if prelude.startswith("@"):
+            name = re.match(r"@([\w-]+)", prelude)
+            if name and name.group(1).lower() in _GROUPING_RULES:
+                body = purge_css(body, used)
+                if not body.strip():
+                    continue
+            out.append(f"{prelude}{{{body}}}")
+            continue
+        selectors = [
+            selector
+            for selector in _split_selectors(prelude)
+            if selector_classes(selector) <= used
+        ]
+        if selectors:
+            out.append(f"{','.join(selectors)}{{{body}}}")
+    return "".join(out)
+
+
+def minify_css(css: str) -> str:
+    """Strip comments (except ``/*! ... */`` notices) and needless whitespace.
+
+    Only whitespace next to ``{ } ; , >`` and after ``:`` is removed, which
+    never changes what a selector or declaration means.
+    """
+    parts = []
+    code = []
+
+    def flush() -> None:
+        text = re.sub(r"\s+", " ", "".join(code))
+        text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+        text = re.sub(r":\s+", ":", text).replace(";}", "}")
+        if not parts or parts[-1].startswith("/*!"):
+            text = text.lstrip()
+        parts.append(text)
+        code.clear()
+
+    i = 0
+    while i < len(css):
+        if css[i] in "\"'":
+            end = _skip_string(css, i)
+            flush()
+            parts.append(css[i:end])
+            i = end
+        elif css.startswith("/*", i):
+            end = _skip_comment(css, i)
+            if css.startswith("/*!", i):
+                flush()
+                parts.append(css[i:end])
+            else:
+                # A comment separates tokens like whitespace does.
+                code.append(" ")
+            i = end
+        else:
+            code.append(css[i])
+            i += 1
+    flush()
+    return "".join(parts).strip()
+
+
+class OptimizedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Purge and minify stylesheets before they are hashed and compressed."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            used = None
+            for name, (storage, path) in list(paths.items()):
+                if not name.endswith(".css"):
+                    continue
+                with storage.open(path) as source:
+                    css = source.read().decode()
+                if name in settings.PURGE_CSS_FILES:
+                    if used is None:
+                        used = content_classes(map(Path, settings.PURGE_CSS_CONTENT))
+                    css = purge_css(css, used)
+                # Replace the collected copy, and hash that one instead of
+                # the source.
+                self.delete(name)
+                self._save(name, ContentFile(minify_css(css).encode()))
+                paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run, **options)
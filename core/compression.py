@@ -0,0 +1,201 @@
+"""
+Brotli and gzip for the responses Django renders.
+
+``CompressionMiddleware`` picks Brotli, then gzip, then identity from the
+request's ``Accept-Encoding``, at the fixed ``COMPRESS_BROTLI_QUALITY`` and
+``COMPRESS_GZIP_LEVEL``. Text responses smaller than ``COMPRESS_MIN_SIZE``
+are sent as they are; streaming ones are compressed chunk by chunk and
+flushed after each, so the browser still gets the page progressively.
+
+Responses that may hold a secret are sent uncompressed, since compressing
+one next to text the request controls leaks the secret through the
+response length (BREACH). That covers the admin, anything that uses a CSRF
+token or the session (both add ``Vary: Cookie``) and anything setting a
+cookie. The public pages use none of these.
+
+A compressed body is cached under a digest of the original when the response
+carries an ETag, i.e. when it is a version of a page rather than a one-off
+like search results. Page cache hits therefore cost a lookup, not a
+compression, and concurrent misses compress once.
+
+Static files never get here: WhiteNoise answers them earlier in the stack
+with the copies collectstatic precompressed.
+"""
+
+import hashlib
+import re
+import zlib
+from collections.abc import AsyncIterator, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli  # pyright: ignore[reportMissingImports]
+except ImportError:
+    brotli = None
+
+_COMPRESSIBLE_TYPES = re.compile(
+    r"^(text/|application/(json|javascript|xml|xhtml\+xml)|image/svg\+xml)"
+)
+
+# Nothing to compress, or (206) a byte range of the identity encoding.
+_SKIPPED_STATUSES = {204, 206, 304}
+
+
+def accepted_encoding(accept_encoding: str) -> str | None:
+    """The encoding to use for ``accept_encoding``: "br", "gzip" or None.
+
+    Follows the client's q-values; between equally weighted codings Brotli
+    wins over gzip.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        if match := re.search(r"q=([0-9.]+)", params):
+            try:
+                weight = float(match.group(1))
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best = max(offered, key=lambda coding: weights.get(coding, wildcard))
+    return best if weights.get(best, wildcard) > 0 else None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br" and brotli is not None:
+            self._brotli = brotli.Compressor(quality=settings.COMPRESS_BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            # wbits 31: a gzip header and trailer around the deflate stream.
+            self._zlib = zlib.compressobj(
+                settings.COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.flush()
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    compressor = _Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+def _compress_chunks(chunks: Iterator[bytes], encoding: str) -> Iterator[bytes]:
+    compressor = _Compressor(encoding)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+async def _acompress_chunks(
+    chunks: AsyncIterator[bytes], encoding: str
+) -> AsyncIterator[bytes]:
+    compressor = _Compressor(encoding)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+def _may_hold_secrets(request: HttpRequest, response: HttpResponseBase) -> bool:
+    match = request.resolver_match
+    if match is not None and "admin" in match.namespaces:
+        return True
+    if response.cookies:
+        return True
+    return "cookie" in (
+        header.strip().lower() for header in response.get("Vary", "").split(",")
+    )
+
+
+class CompressionMiddleware:
+    sync_capable = False
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    async def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = await self.get_response(request)
+        if not self._is_compressible(request, response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = accepted_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if isinstance(response, StreamingHttpResponse):
+            chunks = response.streaming_content
+            if isinstance(chunks, AsyncIterator):
+                response.streaming_content = _acompress_chunks(chunks, encoding)
+            else:
+                response.streaming_content = _compress_chunks(chunks, encoding)
+            del response.headers["Content-Length"]
+        else:
+            body = await self._compressed_content(response, encoding)
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response.headers["Content-Length"] = str(len(body))
+
+        # The compressed body is a different representation of the same
+        # version, as in django.middleware.gzip.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _is_compressible(
+        self, request: HttpRequest, response: HttpResponseBase
+    ) -> bool:
+        if response.status_code in _SKIPPED_STATUSES:
+            return False
+        if _may_hold_secrets(request, response):
+            return False
+        if response.has_header("Content-Encoding"):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        if not _COMPRESSIBLE_TYPES.match(response.get("Content-Type", "")):
+            return False
+        if isinstance(response, StreamingHttpResponse):
+            return True
+        return len(response.content) >= settings.COMPRESS_MIN_SIZE
+
+    async def _compressed_content(self, response, encoding: str) -> bytes:
+        content = response.content
+        if not response.has_header("ETag") or response.status_code != 200:
+            return compress(content, encoding)
+
+        async def compute() -> bytes:
+            return compress(content, encoding)
+
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        return await cache.aget_or_compute(
+            f"compressed:{encoding}:{digest}",
+            compute,
+            settings.COMPRESS_CACHE_TIMEOUT,
+        )
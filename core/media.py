@@ -0,0 +1,162 @@
+"""
+Async file server for user uploads under MEDIA_ROOT.
+
+Replaces ``django.views.static.serve``: files are streamed in chunks from an
+async generator, single byte ranges are answered with 206, and validators plus
+a long ``Cache-Control`` let browsers and the proxy skip the transfer. With
+``MEDIA_OFFLOAD`` set, the response only names the file and the reverse proxy
+sends the bytes.
+"""
+
+import asyncio
+import mimetypes
+import os
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+async def serve_media(request: HttpRequest, path: str) -> HttpResponseBase:
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    try:
+        fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    stat = await asyncio.to_thread(_stat_file, fullpath)
+    if stat is None:
+        raise Http404("File not found")
+
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    last_modified = int(stat.st_mtime)
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        return _with_validators(not_modified, etag, last_modified)
+
+    content_type = mimetypes.guess_type(fullpath)[0] or "application/octet-stream"
+
+    if settings.MEDIA_OFFLOAD:
+        response = HttpResponse(content_type=content_type)
+        if settings.MEDIA_OFFLOAD == "x-sendfile":
+            response["X-Sendfile"] = str(fullpath)
+        else:
+            response["X-Accel-Redirect"] = settings.MEDIA_OFFLOAD_PREFIX + quote(path)
+        return _with_validators(response, etag, last_modified)
+
+    size = stat.st_size
+    try:
+        byte_range = _requested_range(request, size, etag, last_modified)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    start, length = byte_range or (0, size)
+    response: HttpResponseBase
+    if request.method == "HEAD":
+        response = HttpResponse(content_type=content_type)
+    else:
+        response = StreamingHttpResponse(
+            _read_chunks(fullpath, start, length), content_type=content_type
+        )
+    if byte_range:
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{start + length - 1}/{size}"
+    response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    return _with_validators(response, etag, last_modified)
+
+
+def _stat_file(path: Path) -> os.stat_result | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat if path.is_file() else None
+
+
+def _with_validators(
+    response: HttpResponseBase, etag: str, last_modified: int
+) -> HttpResponseBase:
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+    return response
+
+
+def _requested_range(
+    request: HttpRequest, size: int, etag: str, last_modified: int
+) -> tuple[int, int] | None:
+    """Return ``(start, length)`` for a satisfiable single range.
+
+    ``None`` means the whole file should be sent: there is no Range header,
+    it is malformed or asks for several ranges, or If-Range no longer matches.
+    Raises RangeNotSatisfiable when the range lies outside the file.
+    """
+    match = RANGE_RE.match(request.headers.get("Range", "").strip())
+    if not match or not _if_range_passes(request, etag, last_modified):
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiable
+        start = max(size - suffix, 0)
+        return start, size - start
+    start = int(first)
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(last), size - 1) if last else size - 1
+    if end < start:
+        return None
+    return start, end - start + 1
+
+
+def _if_range_passes(request: HttpRequest, etag: str, last_modified: int) -> bool:
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+async def _read_chunks(path: Path, start: int, length: int):
+    handle = await asyncio.to_thread(path.open, "rb")
+    try:
+        await asyncio.to_thread(handle.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(handle.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -62,13 +63,16 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "project",
 ]
 
 MIDDLEWARE = [
     "django_prometheus.middleware.PrometheusBeforeMiddleware",
+    "project.instrumentation.ViewMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.AsyncWhiteNoiseMiddleware",
+    "core.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -82,7 +86,9 @@ ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates that reports render time per view; see
+        # project.instrumentation
+        "BACKEND": "project.instrumentation.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -102,6 +108,12 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DB_POOL=True shares a psycopg pool between a worker's threads. Under ASGI a
+# request can run on any thread, so per-thread persistent connections
+# (DB_CONN_MAX_AGE) are rarely reused; the pool replaces them. Each Granian
+# worker holds up to DB_POOL_MAX_SIZE connections.
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -110,11 +122,91 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
         "HOST": os.getenv("DB_HOST", "localhost"),
         "PORT": os.getenv("DB_PORT", "5432"),
-        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "300")),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "300")),
+        # Pooled: check each connection as it is checked out. Persistent:
+        # check a reused connection at the start of a request.
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", str(DB_POOL))
+        == "True",
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                # Seconds a query waits for a free connection before failing
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+                "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+                "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+            }
+        }
+        if DB_POOL
+        else {},
     }
 }
 
 
+# Two tiers: a bounded LRU in each worker in front of a store all workers
+# share, a directory by default. For several hosts, point CACHE_BACKEND at
+# django.core.cache.backends.redis.RedisCache and CACHE_LOCATION at a
+# redis:// URL. See core.tiered_cache
+CACHES = {
+    "default": {
+        "BACKEND": "core.tiered_cache.TieredCache",
+        "OPTIONS": {
+            "SHARED": "shared",
+            "LOCAL_MAX_ENTRIES": int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "500")),
+            # Also how long another worker may serve an entry after a delete
+            "LOCAL_TIMEOUT": int(os.getenv("CACHE_LOCAL_TIMEOUT", "5")),
+            # Served while one worker recomputes it, once the timeout passed
+            "STALE_TIMEOUT": int(os.getenv("CACHE_STALE_TIMEOUT", "60")),
+        },
+    },
+    "shared": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", str(Path(tempfile.gettempdir()) / "portofolio-cache")
+        ),
+    },
+}
+
+# Full-page cache for the public views; entries are also dropped on Project writes
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "600"))
+
+# Brotli/gzip for the responses Django renders; compressed page versions are
+# cached. See core.compression
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "512"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_CACHE_TIMEOUT = int(os.getenv("COMPRESS_CACHE_TIMEOUT", "600"))
+
+# How long a worker may serve the featured projects after another worker
+# changed them; the worker that made the change drops its copy at once
+FEATURED_CACHE_TIMEOUT = int(os.getenv("FEATURED_CACHE_TIMEOUT", "60"))
+
+# Fill the featured cards and listing snapshots while a worker warms up;
+# see core.warmup
+WARMUP_PRIME_CACHES = os.getenv("WARMUP_PRIME_CACHES", "True") == "True"
+
+# Directory the prerender command writes the public pages to; when set, a
+# Project write also re-renders the pages it affects. See project.prerender
+PRERENDER_ROOT = os.getenv("PRERENDER_ROOT", "")
+
+# Projects per page on the listing; pages are addressed by keyset cursors
+PROJECTS_PAGE_SIZE = int(os.getenv("PROJECTS_PAGE_SIZE", "12"))
+SEARCH_RESULTS_LIMIT = int(os.getenv("SEARCH_RESULTS_LIMIT", "20"))
+
+# JSON API page sizes (?limit= is capped at the maximum), and the rows the
+# export endpoint fetches and encodes per chunk. See project.api
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "200"))
+API_EXPORT_CHUNK_SIZE = int(os.getenv("API_EXPORT_CHUNK_SIZE", "2000"))
+
+# How description/challenge/key_features become HTML on save: "linebreaks"
+# or "markdown" (needs the markdown package); run render_project_text after
+# switching
+PROJECT_TEXT_FORMAT = os.getenv("PROJECT_TEXT_FORMAT", "linebreaks")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -157,10 +249,28 @@ STATICFILES_DIRS = [
 STATIC_ROOT = BASE_DIR / "static"  # where collectstatic will put files
 STATIC_URL = "static/"
 
+# collectstatic purges and minifies the CSS, then writes hashed names and
+# .gz/.br copies, which WhiteNoise serves as immutable. See core.assets
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.assets.OptimizedStaticFilesStorage"},
+}
+
+# Stylesheets that keep only the rules whose classes appear under
+# PURGE_CSS_CONTENT
+PURGE_CSS_FILES = ["css/tailwind.css"]
+PURGE_CSS_CONTENT = [BASE_DIR / "templates", BASE_DIR / "project"]
+
 
 # Media files (User uploaded content)
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", str(60 * 60 * 24 * 30)))
+
+# Hand media transfers to the reverse proxy: "x-accel-redirect" (nginx, Caddy
+# intercept) or "x-sendfile" (Apache, lighttpd). Empty streams from Python.
+MEDIA_OFFLOAD = os.getenv("MEDIA_OFFLOAD", "")
+MEDIA_OFFLOAD_PREFIX = os.getenv("MEDIA_OFFLOAD_PREFIX", "/protected-media/")
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
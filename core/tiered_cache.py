@@ -0,0 +1,306 @@
+"""
+Two-tier cache backend: a bounded LRU in each process in front of a store
+every process shares.
+
+    CACHES = {
+        "default": {
+            "BACKEND": "core.tiered_cache.TieredCache",
+            "OPTIONS": {"SHARED": "shared", "LOCAL_MAX_ENTRIES": 500},
+        },
+        "shared": {"BACKEND": "django.core.cache.backends.redis.RedisCache", ...},
+    }
+
+Reads try the local tier, then the shared one, and copy shared hits into the
+local tier for at most ``LOCAL_TIMEOUT`` seconds. Writes and deletes go to
+both tiers, so the local copies of other processes are what can lag behind a
+delete, by up to ``LOCAL_TIMEOUT``.
+
+``aget_or_compute`` adds stampede protection. A miss is computed once per
+process while concurrent callers wait for that result, and once across
+processes when the shared tier's ``add`` is atomic (Redis, Memcached, the
+database cache). Entries stay in the shared tier ``STALE_TIMEOUT`` seconds
+past their timeout; a stale hit is served as is while one background task
+recomputes it.
+"""
+
+import asyncio
+import contextvars
+import logging
+import pickle
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+from project.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# ``caches`` builds one backend instance per thread and async context, so
+# computations in flight are tracked per process, like LocMemCache's data.
+_flights: dict[tuple[str, str], asyncio.Task] = {}
+
+_POLL_SECONDS = 0.05
+
+# (fresh until, as a time.time() value or None for no timeout; the pickled
+# value). Pickled once here, so the tiers only copy bytes, and callers that
+# shared one computation each unpickle their own copy.
+Envelope = tuple[float | None, bytes]
+
+
+def _dumps(value) -> bytes:
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _is_fresh(envelope: Envelope) -> bool:
+    fresh_until = envelope[0]
+    return fresh_until is None or fresh_until > time.time()
+
+
+def _release_connections() -> None:
+    # What request_finished does after a request; background refreshes run
+    # outside one. A caller's transaction keeps its connection.
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+class TieredCache(BaseCache):
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._name = name
+        self._shared_alias = options.get("SHARED", "shared")
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        self.stale_timeout = options.get("STALE_TIMEOUT", 60)
+        # How long one process may hold the right to compute a key before
+        # the others give up waiting and compute it themselves.
+        self.lock_timeout = options.get("LOCK_TIMEOUT", 10)
+        self.local = LocMemCache(
+            f"tiered:{name}",
+            {
+                "TIMEOUT": self.local_timeout,
+                "OPTIONS": {"MAX_ENTRIES": options.get("LOCAL_MAX_ENTRIES", 500)},
+            },
+        )
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self._shared_alias]
+
+    def _set_local(self, key, envelope: Envelope, version) -> None:
+        fresh_until = envelope[0]
+        timeout = self.local_timeout
+        if fresh_until is not None:
+            timeout = min(timeout, fresh_until - time.time())
+        if timeout > 0:
+            self.local.set(key, envelope, timeout, version)
+
+    def _envelope(
+        self, payload: bytes, timeout
+    ) -> tuple[Envelope, float | None] | None:
+        """The envelope for ``payload`` and its shared-tier timeout.
+
+        ``None`` when ``timeout`` means the value expires at once.
+        """
+        fresh_until = self.get_backend_timeout(timeout)
+        if fresh_until is None:
+            return (None, payload), None
+        remaining = fresh_until - time.time()
+        if remaining <= 0:
+            return None
+        return (fresh_until, payload), remaining + self.stale_timeout
+
+    def _from_shared(self, key, envelope: Envelope | None, version):
+        if envelope is None:
+            CACHE_REQUESTS.labels("shared", "miss").inc()
+        elif _is_fresh(envelope):
+            CACHE_REQUESTS.labels("shared", "hit").inc()
+            self._set_local(key, envelope, version)
+        else:
+            CACHE_REQUESTS.labels("shared", "stale").inc()
+        return envelope
+
+    def _from_local(self, key, version) -> Envelope | None:
+        envelope = self.local.get(key, version=version)
+        CACHE_REQUESTS.labels("local", "miss" if envelope is None else "hit").inc()
+        return envelope
+
+    def _get_envelope(self, key, version) -> Envelope | None:
+        envelope = self._from_local(key, version)
+        if envelope is not None:
+            return envelope
+        return self._from_shared(key, self.shared.get(key, version=version), version)
+
+    async def _aget_envelope(self, key, version) -> Envelope | None:
+        # The local tier is a dict behind a lock; only the shared tier is
+        # worth leaving the event loop for.
+        envelope = self._from_local(key, version)
+        if envelope is not None:
+            return envelope
+        shared = await self.shared.aget(key, version=version)
+        return self._from_shared(key, shared, version)
+
+    def get(self, key, default=None, version=None):
+        envelope = self._get_envelope(key, version)
+        if envelope is None or not _is_fresh(envelope):
+            return default
+        return pickle.loads(envelope[1])
+
+    async def aget(self, key, default=None, version=None):
+        envelope = await self._aget_envelope(key, version)
+        if envelope is None or not _is_fresh(envelope):
+            return default
+        return pickle.loads(envelope[1])
+
+    def _set_payload(self, key, payload: bytes, timeout, version) -> None:
+        stored = self._envelope(payload, timeout)
+        if stored is None:
+            self.delete(key, version)
+            return
+        envelope, shared_timeout = stored
+        self.shared.set(key, envelope, shared_timeout, version)
+        self._set_local(key, envelope, version)
+
+    async def _aset_payload(self, key, payload: bytes, timeout, version) -> None:
+        stored = self._envelope(payload, timeout)
+        if stored is None:
+            await self.adelete(key, version)
+            return
+        envelope, shared_timeout = stored
+        await self.shared.aset(key, envelope, shared_timeout, version)
+        self._set_local(key, envelope, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._set_payload(key, _dumps(value), timeout, version)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        await self._aset_payload(key, _dumps(value), timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        stored = self._envelope(_dumps(value), timeout)
+        if stored is None:
+            return False
+        envelope, shared_timeout = stored
+        added = self.shared.add(key, envelope, shared_timeout, version)
+        if added:
+            self._set_local(key, envelope, version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        envelope = self.shared.get(key, version=version)
+        if envelope is None:
+            return False
+        self._set_payload(key, envelope[1], timeout, version)
+        return True
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version)
+        return self.shared.delete(key, version)
+
+    async def adelete(self, key, version=None):
+        self.local.delete(key, version)
+        return await self.shared.adelete(key, version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    async def aget_or_compute(
+        self,
+        key,
+        compute: Callable[[], Awaitable],
+        timeout=DEFAULT_TIMEOUT,
+        version=None,
+        store: Callable[[object], bool] | None = None,
+    ):
+        """Return the value cached under ``key``, computing it if needed.
+
+        Concurrent callers share one ``compute()``, and each gets its own
+        copy of the result, so ``compute`` must return something picklable.
+        ``store(value)`` decides whether a computed value is cached; by
+        default every value is.
+        """
+        envelope = await self._aget_envelope(key, version)
+        if envelope is not None:
+            if not _is_fresh(envelope):
+                self._flight(key, compute, timeout, version, store, background=True)
+            return pickle.loads(envelope[1])
+        while True:
+            flight = self._flight(
+                key, compute, timeout, version, store, background=False
+            )
+            payload = await asyncio.shield(flight)
+            if payload is not None:
+                return pickle.loads(payload)
+            # Joined a background refresh that left the key to another
+            # process; wait for that one like any other miss.
+
+    def _flight(self, key, compute, timeout, version, store, background: bool):
+        loop = asyncio.get_running_loop()
+        flight_key = (self._name, self.make_key(key, version))
+        task = _flights.get(flight_key)
+        # A task left over from another event loop cannot be awaited here.
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(
+                self._compute(key, compute, timeout, version, store, background),
+                # A background refresh outlives the request that started it,
+                # so it must not run in that request's thread context.
+                context=contextvars.Context() if background else None,
+            )
+            _flights[flight_key] = task
+            task.add_done_callback(partial(_landed, flight_key, key, background))
+        return task
+
+    async def _compute(self, key, compute, timeout, version, store, background):
+        lock = f"{key}:computing"
+        locked = await self.shared.aadd(lock, True, self.lock_timeout, version)
+        try:
+            if not locked:
+                if background:
+                    # Another process is already refreshing it.
+                    return None
+                payload = await self._wait_for_other_process(key, lock, version)
+                if payload is not None:
+                    return payload
+            value = await compute()
+            payload = _dumps(value)
+            if store is None or store(value):
+                await self._aset_payload(key, payload, timeout, version)
+            return payload
+        finally:
+            if locked:
+                await self.shared.adelete(lock, version)
+            if background:
+                await sync_to_async(_release_connections)()
+
+    async def _wait_for_other_process(self, key, lock, version) -> bytes | None:
+        # None once the other process gave up or computed something it did
+        # not store; the caller then computes the value itself.
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+            envelope = await self.shared.aget(key, version=version)
+            if envelope is not None and _is_fresh(envelope):
+                self._set_local(key, envelope, version)
+                return envelope[1]
+            if not await self.shared.ahas_key(lock, version=version):
+                return None
+        return None
+
+
+def _landed(flight_key, key, background: bool, task: asyncio.Task) -> None:
+    if _flights.get(flight_key) is task:
+        del _flights[flight_key]
+    if task.cancelled():
+        return
+    # Callers waiting on the task raise its exception themselves; nobody
+    # waits on a background refresh, so its failure is logged here.
+    exc = task.exception()
+    if exc is not None and background:
+        logger.error("Refreshing cache key %s failed", key, exc_info=exc)
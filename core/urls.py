@@ -1,14 +1,19 @@
 from django.contrib import admin
 from django.urls import path, re_path, include
-from django.conf import settings
-from django.views.static import serve
-from project import views
+from core.media import serve_media
+from core.warmup import ready
+from project import api, views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", views.home, name="home"),
     path("projects/", views.project_list, name="projects"),
     path("projects/<int:pk>/", views.project_detail, name="project_detail"),
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    path("search/", views.project_search, name="search"),
+    path("api/projects/", api.project_list, name="api_projects"),
+    path("api/projects/export/", api.project_export, name="api_project_export"),
+    path("api/projects/<int:pk>/", api.project_detail, name="api_project_detail"),
+    path("ready/", ready, name="ready"),
+    re_path(r"^media/(?P<path>.*)$", serve_media),
     path("", include("django_prometheus.urls")),
 ]
@@ -0,0 +1,158 @@
+"""
+Warm a worker up before it takes traffic.
+
+``WarmupMiddleware`` wraps the ASGI application and answers the lifespan
+protocol: on startup it compiles every template under ``TEMPLATES`` DIRS,
+populates the URL resolver, runs a query on each database (filling its
+pool, when pooled) and, with ``WARMUP_PRIME_CACHES``, fills the per-process
+caches. Granian holds requests until startup completes, so the first
+visitor after a deploy or a worker restart no longer pays for any of it.
+
+``/ready/`` answers 503 until a warm-up has succeeded. A failed warm-up does
+not fail startup; the readiness probe retries it instead.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.template import engines
+from django.urls import URLResolver, get_resolver
+from django.views.decorators.cache import never_cache
+
+from project.listing import featured_projects, listing_snapshot
+from project.models import PROJECT_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class WarmupState:
+    ready: bool = False
+    templates: int = 0
+    routes: int = 0
+    seconds: float = 0.0
+
+
+state = WarmupState()
+
+
+def load_templates() -> int:
+    """Compile every template file under the engines' DIRS into their caches."""
+    count = 0
+    for backend in engines.all():
+        for directory in map(Path, backend.dirs):
+            for path in sorted(directory.rglob("*")):
+                if path.is_file():
+                    backend.get_template(path.relative_to(directory).as_posix())
+                    count += 1
+    return count
+
+
+def load_urls() -> int:
+    """Import every URLconf and compile every route's pattern."""
+    resolver = get_resolver()
+    # Populating the reverse lookups walks the included URLconfs.
+    _ = resolver.reverse_dict
+    return _compile_patterns(resolver.url_patterns)
+
+
+def _compile_patterns(patterns) -> int:
+    count = 0
+    for pattern in patterns:
+        # Compiled on first access.
+        _ = pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            count += _compile_patterns(pattern.url_patterns)
+        else:
+            count += 1
+    return count
+
+
+def check_databases() -> None:
+    for connection in connections.all():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if (pool := getattr(connection, "pool", None)) is not None:
+            # Opens min_size connections now rather than during the first
+            # requests.
+            pool.wait()
+
+
+def release_connections() -> None:
+    # Warm-up runs outside any request, so nothing else hands its pooled
+    # connections back. A caller's transaction keeps its connection.
+    for connection in connections.all(initialized_only=True):
+        if getattr(connection, "pool", None) and not connection.in_atomic_block:
+            connection.close()
+
+
+async def prime_caches() -> None:
+    await featured_projects()
+    # Builds any snapshot a migration or a page size change left missing.
+    for category in ("all", *PROJECT_CATEGORIES):
+        await listing_snapshot(HttpRequest(), category)
+
+
+def _warm_up_sync() -> tuple[int, int]:
+    templates = load_templates()
+    routes = load_urls()
+    check_databases()
+    return templates, routes
+
+
+async def warm_up() -> bool:
+    """Run every warm-up step; returns whether the worker is now ready."""
+    started = time.perf_counter()
+    try:
+        templates, routes = await sync_to_async(_warm_up_sync)()
+        if settings.WARMUP_PRIME_CACHES:
+            await prime_caches()
+        await sync_to_async(release_connections)()
+    except Exception:
+        logger.exception("Warm-up failed; /ready/ will retry it")
+        return False
+    state.templates, state.routes = templates, routes
+    state.seconds = time.perf_counter() - started
+    state.ready = True
+    logger.info(
+        "Warmed up in %.2fs: %d templates, %d routes",
+        state.seconds,
+        templates,
+        routes,
+    )
+    return True
+
+
+class WarmupMiddleware:
+    """ASGI wrapper running ``warm_up`` on lifespan startup.
+
+    Django itself only speaks HTTP, so lifespan messages end here.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.app(scope, receive, send)
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await warm_up()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+@never_cache
+async def ready(request: HttpRequest) -> HttpResponse:
+    if not state.ready and not await warm_up():
+        return HttpResponse("warming up", status=503, content_type="text/plain")
+    return HttpResponse("ready", content_type="text/plain")
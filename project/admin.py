@@ -1,11 +1,21 @@
 from django.contrib import admin
 from .models import Project
+from .search import matching
 
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ("title", "category", "year", "role")
-    list_filter = ("category", "year")
+    list_display = (
+        "title",
+        "category",
+        "year",
+        "role",
+        "featured",
+        "featured_order",
+        "updated_at",
+    )
+    list_editable = ("featured", "featured_order")
+    list_filter = ("featured", "category", "year")
     search_fields = ("title", "short_summary", "description")
 
     fieldsets = (
@@ -31,12 +41,26 @@ class ProjectAdmin(admin.ModelAdmin):
                 "description": "Full project details for the detail page",
             },
         ),
+        (
+            "Home Page",
+            {
+                "fields": ("featured", "featured_order"),
+                "description": "Featured projects are shown on the home page, lowest order first",
+            },
+        ),
         (
             "Media",
             {"fields": ("image",), "description": "Project thumbnail/hero image"},
         ),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        # Same GIN-indexed vector as the public search instead of icontains
+        # scans over the TextFields; search_fields only enables the search box.
+        if not search_term.strip():
+            return queryset, False
+        return matching(queryset, search_term), False
+
     def get_readonly_fields(self, request, obj=None):
         # Make created/updated fields readonly if they exist
         return []
@@ -0,0 +1,195 @@
+"""Read-only JSON for projects, for widgets and aggregators.
+
+``/api/projects/`` lists projects newest first, filtered by ``category``,
+``year`` and ``tag`` and paged by the listing's keyset cursors.
+``/api/projects/<pk>/`` returns one project. Both take ``?fields=`` to pick
+the keys of each object; only those columns are selected, and the tag
+subquery only runs when ``tags`` is asked for.
+
+``/api/projects/export/`` returns every match as one JSON array, streamed
+from a server-side cursor ``API_EXPORT_CHUNK_SIZE`` rows at a time, so its
+memory stays the same however many projects there are.
+"""
+
+from collections.abc import AsyncIterator
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+
+from .listing import dumps
+from .models import Project, sort_keys
+from .pagination import InvalidCursor, keyset_page
+
+FIELDS = (
+    "id",
+    "uuid",
+    "title",
+    "category",
+    "year",
+    "short_summary",
+    "role",
+    "stack",
+    "tags",
+    "repository",
+    "featured",
+    "image",
+    "challenge",
+    "key_features",
+    "description",
+    "challenge_html",
+    "key_features_html",
+    "description_html",
+    "updated_at",
+)
+# What a listing card shows; the detail endpoint defaults to every field.
+LIST_FIELDS = ("id", "title", "category", "year", "short_summary", "tags")
+
+# Always selected: the keyset cursors are built from them.
+_CURSOR_COLUMNS = ("id", "year")
+
+_ENCODERS = {
+    "uuid": str,
+    "image": lambda name: default_storage.url(name) if name else "",
+    "updated_at": lambda value: value.isoformat(),
+}
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+def requested_fields(request: HttpRequest, default: tuple[str, ...]) -> tuple[str, ...]:
+    """The ``?fields=`` of ``request`` in the order given, or ``default``."""
+    names = [name.strip() for name in request.GET.get("fields", "").split(",")]
+    fields = tuple(dict.fromkeys(name for name in names if name))
+    if unknown := [name for name in fields if name not in FIELDS]:
+        raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+    return fields or default
+
+
+def filtered_projects(request: HttpRequest) -> QuerySet[Project]:
+    year = request.GET.get("year")
+    projects = Project.objects.for_category(request.GET.get("category")).with_tag(
+        request.GET.get("tag")
+    )
+    if year:
+        try:
+            projects = projects.filter(year=int(year))
+        except ValueError:
+            raise InvalidQuery(f"Invalid year: {year}")
+    return projects
+
+
+def project_rows(queryset: QuerySet[Project], fields: tuple[str, ...]) -> QuerySet:
+    """Named rows of ``queryset`` with the columns ``fields`` needs."""
+    columns = [name for name in fields if name != "tags"]
+    if "tags" in fields:
+        queryset = queryset.with_tag_names()
+        columns.append("tag_names")
+    return queryset.values_list(
+        *dict.fromkeys((*_CURSOR_COLUMNS, *columns)), named=True
+    )
+
+
+def project_json(row, fields: tuple[str, ...]) -> dict:
+    item = {}
+    for name in fields:
+        value = getattr(row, "tag_names" if name == "tags" else name)
+        if name in _ENCODERS:
+            value = _ENCODERS[name](value)
+        item[name] = value
+    return item
+
+
+def _page_size(request: HttpRequest) -> int:
+    limit = request.GET.get("limit")
+    if not limit:
+        return settings.API_PAGE_SIZE
+    try:
+        size = int(limit)
+    except ValueError:
+        raise InvalidQuery(f"Invalid limit: {limit}")
+    return max(1, min(size, settings.API_MAX_PAGE_SIZE))
+
+
+def _page_url(request: HttpRequest, cursor: str | None) -> str | None:
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query["cursor"] = cursor
+    return f"{request.path}?{query.urlencode()}"
+
+
+def _json(data, status: int = 200) -> HttpResponse:
+    return HttpResponse(dumps(data), content_type="application/json", status=status)
+
+
+@require_safe
+async def project_list(request: HttpRequest) -> HttpResponse:
+    try:
+        fields = requested_fields(request, LIST_FIELDS)
+        page = await keyset_page(
+            project_rows(filtered_projects(request), fields),
+            request.GET.get("cursor"),
+            _page_size(request),
+        )
+    except InvalidCursor:
+        return _json({"error": "Invalid page cursor"}, status=400)
+    except InvalidQuery as error:
+        return _json({"error": str(error)}, status=400)
+
+    return _json(
+        {
+            "results": [project_json(row, fields) for row in page.items],
+            "next": _page_url(request, page.next_cursor),
+            "previous": _page_url(request, page.previous_cursor),
+        }
+    )
+
+
+@require_safe
+async def project_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    try:
+        fields = requested_fields(request, FIELDS)
+    except InvalidQuery as error:
+        return _json({"error": str(error)}, status=400)
+    row = await project_rows(Project.objects.filter(pk=pk), fields).afirst()
+    if row is None:
+        return _json({"error": "Not found"}, status=404)
+    return _json(project_json(row, fields))
+
+
+async def _export_chunks(
+    rows: QuerySet, fields: tuple[str, ...]
+) -> AsyncIterator[bytes]:
+    # Each chunk is the next rows of the array, encoded in one call.
+    chunk_size = settings.API_EXPORT_CHUNK_SIZE
+    yield b"["
+    separator = b""
+    batch = []
+    async for row in rows.aiterator(chunk_size=chunk_size):
+        batch.append(project_json(row, fields))
+        if len(batch) == chunk_size:
+            yield separator + dumps(batch)[1:-1]
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + dumps(batch)[1:-1]
+    yield b"]"
+
+
+@require_safe
+async def project_export(request: HttpRequest) -> HttpResponse | StreamingHttpResponse:
+    try:
+        fields = requested_fields(request, LIST_FIELDS)
+        projects = filtered_projects(request)
+        year_key, id_key = sort_keys(projects)
+        rows = project_rows(projects, fields).order_by(f"-{year_key}", f"-{id_key}")
+    except InvalidQuery as error:
+        return _json({"error": str(error)}, status=400)
+    return StreamingHttpResponse(
+        _export_chunks(rows, fields), content_type="application/json"
+    )
@@ -0,0 +1,150 @@
+from collections.abc import Callable
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from prometheus_client import REGISTRY
+
+from .listing import GRID_FRAGMENT, is_grid_fragment, snapshot_category
+from .metrics import PAGE_CACHE_REQUESTS
+from .models import PROJECT_CATEGORIES
+
+CacheKeyFunc = Callable[..., str | None]
+
+
+def home_cache_key(request: HttpRequest) -> str:
+    return "page:home"
+
+
+def project_list_cache_key(request: HttpRequest) -> str | None:
+    # Only snapshot pages are cached: invalidation can name every one of
+    # them, and arbitrary query strings cannot fill the cache.
+    category = snapshot_category(request)
+    if category is None:
+        return None
+    if is_grid_fragment(request):
+        return f"page:projects:{category}:{GRID_FRAGMENT}"
+    return f"page:projects:{category}"
+
+
+def project_detail_cache_key(request: HttpRequest, pk: int) -> str:
+    return f"page:project:{pk}"
+
+
+def cache_page_view(view_name: str, key_func: CacheKeyFunc):
+    """Serve GET/HEAD responses of a public view from the page cache.
+
+    Only successful responses are stored. Entries live until
+    ``PAGE_CACHE_TIMEOUT`` or until a ``Project`` write invalidates them;
+    see core.tiered_cache for what happens around a miss.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method not in ("GET", "HEAD"):
+                return await view(request, *args, **kwargs)
+            key = key_func(request, *args, **kwargs)
+            if key is None:
+                return await view(request, *args, **kwargs)
+
+            if _is_conditional(request):
+                # On a miss the view's own ETag check answers without
+                # rendering. Its 304 only suits this request, so it is
+                # neither shared with other misses nor stored.
+                response = await cache.aget(key)
+                if response is None:
+                    PAGE_CACHE_REQUESTS.labels(view_name, "miss").inc()
+                    return await view(request, *args, **kwargs)
+                PAGE_CACHE_REQUESTS.labels(view_name, "hit").inc()
+                return _revalidate(request, response)
+
+            rendered = False
+
+            async def render() -> HttpResponse:
+                nonlocal rendered
+                rendered = True
+                return await view(request, *args, **kwargs)
+
+            # Concurrent misses wait for one render, and a page past its
+            # timeout is served stale while it is rendered again.
+            response = await cache.aget_or_compute(
+                key, render, settings.PAGE_CACHE_TIMEOUT, store=_is_cacheable
+            )
+            PAGE_CACHE_REQUESTS.labels(view_name, "miss" if rendered else "hit").inc()
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _is_conditional(request: HttpRequest) -> bool:
+    return "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+
+
+def _is_cacheable(response: HttpResponse) -> bool:
+    return response.status_code == 200
+
+
+def _revalidate(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+    # Answer conditional requests from the stored validators, so a cached
+    # page can still produce a 304 without touching the database.
+    last_modified = response.get("Last-Modified")
+    conditional = get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+        response=response,
+    )
+    return conditional or response
+
+
+def invalidate_project_pages(*pks: int) -> None:
+    # A write can move a project between categories or in and out of the
+    # featured set, so every listing variant, its grid fragment and home go
+    # with the detail pages.
+    keys = [
+        "page:home",
+        *(
+            f"page:projects:{category}{suffix}"
+            for category in ("all", *PROJECT_CATEGORIES)
+            for suffix in ("", f":{GRID_FRAGMENT}")
+        ),
+        *(f"page:project:{pk}" for pk in pks),
+    ]
+    cache.delete_many(keys)
+
+
+def page_cache_hit_ratio(view_name: str) -> float | None:
+    """Hits over lookups for ``view_name`` since process start."""
+    hits = _lookups(view_name, "hit")
+    total = hits + _lookups(view_name, "miss")
+    if not total:
+        return None
+    return hits / total
+
+
+def _lookups(view_name: str, result: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "project_page_cache_requests_total", {"view": view_name, "result": result}
+    )
+    return value or 0.0
+
+
+def cache_tier_hit_ratio(tier: str) -> float | None:
+    """Fresh hits over lookups in one tier ("local" or "shared") since process start."""
+    counts = {
+        result: REGISTRY.get_sample_value(
+            "project_cache_requests_total", {"tier": tier, "result": result}
+        )
+        or 0.0
+        for result in ("hit", "stale", "miss")
+    }
+    total = sum(counts.values())
+    if not total:
+        return None
+    return counts["hit"] / total
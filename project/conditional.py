@@ -0,0 +1,126 @@
+import datetime
+import hashlib
+from functools import cache, wraps
+
+from django.conf import settings
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .listing import (
+    featured_projects,
+    is_grid_fragment,
+    listing_page,
+    listing_snapshot,
+    snapshot_category,
+)
+from .models import PROJECT_CATEGORIES, Project
+from .pagination import InvalidCursor
+
+
+@cache
+def _templates_digest() -> str:
+    # Part of every ETag so a deploy that changes the markup does not keep
+    # answering 304 for pages rendered by the previous release.
+    digest = hashlib.blake2b(digest_size=4)
+    for path in sorted((settings.BASE_DIR / "templates").rglob("*.html")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def condition(etag_func=None, last_modified_func=None):
+    """Async counterpart of ``django.views.decorators.http.condition``.
+
+    Django's decorator calls the validator functions synchronously, which
+    cannot query from an async view; here they are awaited instead.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            etag = None
+            if etag_func and (value := await etag_func(request, *args, **kwargs)):
+                etag = quote_etag(value)
+            last_modified = None
+            if last_modified_func and (
+                dt := await last_modified_func(request, *args, **kwargs)
+            ):
+                if not timezone.is_aware(dt):
+                    dt = timezone.make_aware(dt, datetime.UTC)
+                last_modified = int(dt.timestamp())
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+async def _version(request: HttpRequest, queryset: QuerySet[Project]) -> dict:
+    # ETag and Last-Modified are computed separately by the condition
+    # decorator; share one aggregate query between them.
+    if not hasattr(request, "_project_version"):
+        request._project_version = await queryset.aaggregate(
+            count=Count("pk"), updated=Max("updated_at")
+        )
+    return request._project_version
+
+
+def _etag(version: dict, *parts: object) -> str | None:
+    if version["updated"] is None:
+        return None
+    stamp = int(version["updated"].timestamp() * 1_000_000)
+    return "-".join(
+        str(part) for part in (_templates_digest(), *parts, version["count"], stamp)
+    )
+
+
+async def home_etag(request: HttpRequest) -> str:
+    featured = await featured_projects()
+    return f"{_templates_digest()}-home-{featured.version}"
+
+
+async def project_list_etag(request: HttpRequest) -> str | None:
+    # The grid fragment is a different body for the same data.
+    page = "projects-grid" if is_grid_fragment(request) else "projects"
+    if category := snapshot_category(request):
+        snapshot = await listing_snapshot(request, category)
+        return f"{_templates_digest()}-{page}-{category}-v{snapshot.version}"
+    # Versioned by the rows on the page rather than by every match, so a
+    # tag or a deep cursor costs the page's own range scan and no more.
+    try:
+        listing = await listing_page(request)
+    except InvalidCursor:
+        return None  # The view answers 404.
+    digest = hashlib.blake2b(digest_size=8)
+    for row in listing.items:
+        digest.update(f"{row.id}:{row.updated_at.timestamp()},".encode())
+    digest.update(f"{listing.next_cursor}:{listing.previous_cursor}".encode())
+    category = request.GET.get("category") or "all"
+    if category != "all" and category not in PROJECT_CATEGORIES:
+        # Keep raw query strings out of the header; the page is always empty.
+        category = "unknown"
+    return f"{_templates_digest()}-{page}-{category}-{digest.hexdigest()}"
+
+
+async def project_detail_etag(request: HttpRequest, pk: int) -> str | None:
+    version = await _version(request, Project.objects.filter(pk=pk))
+    return _etag(version, "project", pk)
+
+
+async def project_detail_last_modified(
+    request: HttpRequest, pk: int
+) -> datetime.datetime | None:
+    return (await _version(request, Project.objects.filter(pk=pk)))["updated"]
@@ -0,0 +1,105 @@
+import logging
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import ImageFieldFile
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import Project
+
+logger = logging.getLogger(__name__)
+
+# Card, two-column, detail hero and retina hero widths, in CSS pixels.
+VARIANT_WIDTHS = (320, 640, 960, 1280)
+
+# Ordered by preference; <picture> offers them to the browser in this order.
+VARIANT_FORMATS = {
+    "avif": {"format": "AVIF", "quality": 55},
+    "webp": {"format": "WEBP", "quality": 80},
+}
+
+
+def available_formats() -> list[str]:
+    return [fmt for fmt in VARIANT_FORMATS if features.check(fmt)]
+
+
+def variant_name(source: str, width: int, fmt: str) -> str:
+    path = PurePosixPath(source)
+    return str(path.with_name(f"{path.stem}-{width}w.{fmt}"))
+
+
+def needs_variants(project: Project) -> bool:
+    if not project.image:
+        return bool(project.image_variants)
+    return project.image_variants.get("source") != project.image.name
+
+
+def build_variants(image: ImageFieldFile) -> dict:
+    """Write resized copies of ``image`` next to it and describe them.
+
+    Returns ``{"source": name, "<fmt>": [[width, name], ...]}``. Images Pillow
+    cannot read get an entry without formats so they are not retried on every
+    save.
+    """
+    variants: dict = {"source": image.name}
+    try:
+        with image.open("rb") as fh, Image.open(fh) as original:
+            original = ImageOps.exif_transpose(original)
+            if original.mode not in ("RGB", "RGBA"):
+                original = original.convert("RGBA" if "A" in original.mode else "RGB")
+            for fmt in available_formats():
+                variants[fmt] = _write_format(image, original, fmt)
+    except (UnidentifiedImageError, OSError):
+        logger.warning("Could not build image variants for %s", image.name)
+    return variants
+
+
+def _write_format(image: ImageFieldFile, original: Image.Image, fmt: str) -> list:
+    widths = [w for w in VARIANT_WIDTHS if w < original.width] or [original.width]
+    options = VARIANT_FORMATS[fmt]
+    # Only called once the file has been opened, so it has a name.
+    source = image.name or ""
+    written = []
+    for width in widths:
+        height = max(1, round(original.height * width / original.width))
+        buffer = BytesIO()
+        original.resize((width, height), Image.Resampling.LANCZOS).save(
+            buffer, options["format"], quality=options["quality"]
+        )
+        name = variant_name(source, width, fmt)
+        if image.storage.exists(name):
+            image.storage.delete(name)
+        written.append(
+            [width, image.storage.save(name, ContentFile(buffer.getvalue()))]
+        )
+    return written
+
+
+def delete_variants(image: ImageFieldFile, variants: dict) -> None:
+    for fmt in VARIANT_FORMATS:
+        for _width, name in variants.get(fmt, []):
+            image.storage.delete(name)
+
+
+def refresh_variants(project: Project, force: bool = False, touch: bool = True) -> bool:
+    """Rebuild ``project.image_variants`` if the upload changed.
+
+    Stores the result with ``update()`` so the save signals do not fire
+    again. ``updated_at`` is bumped too, so the pages' ETags change, unless
+    ``touch`` is false because the save calling this has just set it.
+    Callers outside a save refresh the cached pages themselves; see
+    ``project.signals.refresh_project_pages``. Returns whether anything was
+    rebuilt.
+    """
+    if not force and not needs_variants(project):
+        return False
+    if project.image_variants:
+        delete_variants(project.image, project.image_variants)
+    project.image_variants = build_variants(project.image) if project.image else {}
+    fields = {"image_variants": project.image_variants}
+    if touch:
+        project.updated_at = fields["updated_at"] = timezone.now()
+    Project.objects.filter(pk=project.pk).update(**fields)
+    return True
@@ -0,0 +1,116 @@
+"""Break a request's cost down by where it went.
+
+``ViewMetricsMiddleware`` starts a ``RequestCost`` for each request; every
+database connection carries an execute wrapper and the template backend
+times its top-level renders, both adding to the current ``RequestCost``.
+Once the view has resolved, the totals go to the histograms in
+``project.metrics`` under the URL name.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.template.backends.django import DjangoTemplates, Template
+
+from .metrics import (
+    VIEW_DB_SECONDS,
+    VIEW_QUERIES,
+    VIEW_RENDER_SECONDS,
+    VIEW_RESPONSE_BYTES,
+)
+
+
+@dataclass(slots=True)
+class RequestCost:
+    queries: int = 0
+    db_seconds: float = 0.0
+    render_seconds: float = 0.0
+
+
+# asgiref copies the context into sync_to_async threads, so async ORM calls
+# made on a worker thread still add to the request's RequestCost.
+_current_cost: ContextVar[RequestCost | None] = ContextVar("request_cost", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    cost = _current_cost.get()
+    if cost is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        cost.queries += 1
+        cost.db_seconds += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver adding ``record_query`` once per connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        cost = _current_cost.get()
+        if cost is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            cost.render_seconds += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each page it renders.
+
+    Includes and extends render inside the outer template, so they are not
+    counted twice.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class ViewMetricsMiddleware:
+    sync_capable = False
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    async def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        cost = RequestCost()
+        token = _current_cost.set(cost)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_cost.reset(token)
+        # Requests that never resolved (404s, static files) are left out so
+        # arbitrary paths cannot create label values.
+        if request.resolver_match is not None:
+            observe(request.resolver_match.view_name, cost, response)
+        return response
+
+
+def observe(view: str, cost: RequestCost, response: HttpResponseBase) -> None:
+    VIEW_QUERIES.labels(view).observe(cost.queries)
+    VIEW_DB_SECONDS.labels(view).observe(cost.db_seconds)
+    VIEW_RENDER_SECONDS.labels(view).observe(cost.render_seconds)
+    if response.has_header("Content-Length"):
+        size = int(response["Content-Length"])
+    elif isinstance(response, HttpResponse):
+        size = len(response.content)
+    else:
+        return
+    VIEW_RESPONSE_BYTES.labels(view).observe(size)
@@ -0,0 +1,271 @@
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import TypeIs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest
+from django.utils.safestring import SafeString, mark_safe
+
+from .models import PROJECT_CATEGORIES, ListingSnapshot, Project
+from .pagination import NEXT, KeysetPage, encode_cursor, keyset_page, page_queryset
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:
+    orjson = None
+
+# Escaped like django.utils.html.json_script, so the output can be placed
+# inside a <script> element as is.
+_SCRIPT_ESCAPES = ((b"&", b"\\u0026"), (b"<", b"\\u003c"), (b">", b"\\u003e"))
+
+
+def dumps(value) -> bytes:
+    """Serialize ``value`` to compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        raw = orjson.dumps(value)
+    else:
+        raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+    for char, escape in _SCRIPT_ESCAPES:
+        raw = raw.replace(char, escape)
+    return raw
+
+
+@dataclass(slots=True)
+class ProjectCard:
+    """What the home and listing pages show for one project.
+
+    Built from ``Project.objects.listing()`` rows, so list pages never load
+    ``challenge``, ``key_features`` or ``description`` and never build model
+    instances. Tag names arrive with the row, read from the tag table.
+    """
+
+    id: int
+    title: str
+    category: str
+    year: int
+    short_summary: str
+    tags: list[str]
+    image: str
+    image_variants: dict
+
+    @classmethod
+    def from_row(cls, row) -> "ProjectCard":
+        return cls(
+            id=row.id,
+            title=row.title,
+            category=row.category,
+            year=row.year,
+            short_summary=row.short_summary,
+            tags=row.tag_names,
+            image=row.image,
+            image_variants=row.image_variants,
+        )
+
+    @property
+    def category_display(self) -> str:
+        return PROJECT_CATEGORIES.get(self.category, self.category)
+
+    def as_json(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "category": self.category,
+            "year": self.year,
+            "short_summary": self.short_summary,
+            "tags": self.tags,
+        }
+
+
+# Changes whenever ProjectCard gains, loses or renames a field, so snapshots
+# stored by a previous release are rebuilt instead of failing to load.
+CARD_SCHEMA = hashlib.blake2b(
+    ",".join(f"{field.name}:{field.type}" for field in fields(ProjectCard)).encode(),
+    digest_size=4,
+).hexdigest()
+
+
+def projects_json(cards: list[ProjectCard]) -> SafeString:
+    return mark_safe(dumps([card.as_json() for card in cards]).decode())
+
+
+GRID_FRAGMENT = "grid"
+
+
+def is_grid_fragment(request: HttpRequest) -> bool:
+    """Whether ``request`` asks for the listing's grid partial alone.
+
+    The category buttons fetch ``?fragment=grid`` and swap it into the page
+    they are on, so the layout and ``projects_json`` are not sent again.
+    """
+    return request.GET.get("fragment") == GRID_FRAGMENT
+
+
+def snapshot_category(request: HttpRequest) -> str | None:
+    """The category whose snapshot answers ``request``, if any.
+
+    Only the first page of a known category without a tag filter has one;
+    other pages are built per request.
+    """
+    if request.GET.get("cursor") or request.GET.get("tag"):
+        return None
+    category = request.GET.get("category") or "all"
+    if category != "all" and category not in PROJECT_CATEGORIES:
+        return None
+    return category
+
+
+def rebuild_listing_snapshot(category: str) -> ListingSnapshot:
+    page_size = settings.PROJECTS_PAGE_SIZE
+    page, _direction = page_queryset(
+        Project.objects.for_category(category).listing(), None, page_size
+    )
+    rows = list(page)
+    cards = [ProjectCard.from_row(row) for row in rows[:page_size]]
+    snapshot = ListingSnapshot(
+        category=category,
+        page_size=page_size,
+        schema=CARD_SCHEMA,
+        cards=[asdict(card) for card in cards],
+        payload=dumps([card.as_json() for card in cards]),
+        next_cursor=encode_cursor(cards[-1], NEXT) if len(rows) > page_size else "",
+    )
+    # One upsert, so concurrent rebuilds cannot collide on the insert and
+    # every rebuild gets its own version.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {ListingSnapshot._meta.db_table}
+                (category, version, page_size, schema, cards, payload,
+                 next_cursor, updated_at)
+            VALUES (%s, 1, %s, %s, %s::jsonb, %s, %s, now())
+            ON CONFLICT (category) DO UPDATE SET
+                version = {ListingSnapshot._meta.db_table}.version + 1,
+                page_size = EXCLUDED.page_size,
+                schema = EXCLUDED.schema,
+                cards = EXCLUDED.cards,
+                payload = EXCLUDED.payload,
+                next_cursor = EXCLUDED.next_cursor,
+                updated_at = EXCLUDED.updated_at
+            RETURNING version, updated_at
+            """,
+            [
+                category,
+                page_size,
+                CARD_SCHEMA,
+                json.dumps(snapshot.cards),
+                snapshot.payload,
+                snapshot.next_cursor,
+            ],
+        )
+        snapshot.version, snapshot.updated_at = cursor.fetchone()
+    return snapshot
+
+
+def rebuild_listing_snapshots() -> None:
+    for category in ("all", *PROJECT_CATEGORIES):
+        rebuild_listing_snapshot(category)
+
+
+def is_current_snapshot(snapshot: ListingSnapshot | None) -> TypeIs[ListingSnapshot]:
+    """Whether ``snapshot`` was written for this page size and card layout."""
+    return (
+        snapshot is not None
+        and snapshot.page_size == settings.PROJECTS_PAGE_SIZE
+        and snapshot.schema == CARD_SCHEMA
+    )
+
+
+async def listing_snapshot(request: HttpRequest, category: str) -> ListingSnapshot:
+    """Return the snapshot for ``category``, building it if it is missing.
+
+    Snapshots written for another page size or card layout are rebuilt too.
+
+    Memoized on the request so the ETag and the view share one query.
+    """
+    if not hasattr(request, "_listing_snapshot"):
+        snapshot = await ListingSnapshot.objects.filter(category=category).afirst()
+        if not is_current_snapshot(snapshot):
+            snapshot = await sync_to_async(rebuild_listing_snapshot)(category)
+        request._listing_snapshot = snapshot
+    return request._listing_snapshot
+
+
+async def listing_page(request: HttpRequest) -> KeysetPage:
+    """Return the listing page ``request`` asks for when no snapshot answers it.
+
+    Raises InvalidCursor for a cursor this listing did not issue.
+
+    Memoized on the request so the ETag and the view share one query.
+    """
+    if not hasattr(request, "_listing_page"):
+        request._listing_page = await keyset_page(
+            Project.objects.for_category(request.GET.get("category"))
+            .with_tag(request.GET.get("tag"))
+            .listing(),
+            request.GET.get("cursor"),
+            settings.PROJECTS_PAGE_SIZE,
+        )
+    return request._listing_page
+
+
+@dataclass(slots=True)
+class FeaturedProjects:
+    cards: list[ProjectCard]
+    # Digest of the cards; the home page ETag.
+    version: str
+    expires: float
+
+
+_featured: FeaturedProjects | None = None
+# Bumped on every forget, so a load that started before a write cannot
+# store what it read.
+_featured_generation = 0
+
+
+def build_featured_projects(cards: list[ProjectCard]) -> FeaturedProjects:
+    return FeaturedProjects(
+        cards=cards,
+        version=hashlib.blake2b(
+            dumps([asdict(card) for card in cards]), digest_size=8
+        ).hexdigest(),
+        expires=time.monotonic() + settings.FEATURED_CACHE_TIMEOUT,
+    )
+
+
+async def featured_projects() -> FeaturedProjects:
+    """The home page's featured cards, cached in this process.
+
+    A ``Project`` write drops the cache in the process that made it; other
+    workers reload within ``FEATURED_CACHE_TIMEOUT`` seconds.
+    """
+    global _featured
+    if _featured is None or _featured.expires <= time.monotonic():
+        generation = _featured_generation
+        featured = build_featured_projects(
+            [
+                ProjectCard.from_row(row)
+                async for row in Project.objects.featured().listing()
+            ]
+        )
+        if generation != _featured_generation:
+            return featured
+        _featured = featured
+    return _featured
+
+
+def forget_featured_projects() -> None:
+    global _featured, _featured_generation
+    _featured = None
+    _featured_generation += 1
+
+
+def snapshot_cards(snapshot: ListingSnapshot) -> list[ProjectCard]:
+    return [ProjectCard(**card) for card in snapshot.cards]
+
+
+def snapshot_json(snapshot: ListingSnapshot) -> SafeString:
+    return mark_safe(bytes(snapshot.payload).decode())
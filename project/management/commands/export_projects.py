@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from project.transfer import FORMATS, export_projects, file_format
+
+
+class Command(BaseCommand):
+    help = "Stream every project to a JSONL or CSV file with COPY"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", nargs="?", default="-", help="Output file, or - for stdout"
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Defaults to the file extension, or jsonl",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or file_format(path)
+        if path == "-":
+            count = export_projects(sys.stdout.buffer, fmt)
+            # Keep stdout for the data.
+            self.stderr.write(f"Exported {count} projects")
+            return
+        with open(path, "wb") as out:
+            count = export_projects(out, fmt)
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} projects to {path}"))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from project.images import refresh_variants
+from project.models import Project
+from project.signals import refresh_project_pages
+
+
+class Command(BaseCommand):
+    help = "Build missing AVIF/WebP image variants for existing projects"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild variants even if they match the current upload",
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.exclude(image="").only(
+            "pk", "title", "image", "image_variants"
+        )
+        built = []
+        for project in projects.iterator():
+            if refresh_variants(project, force=options["force"]):
+                built.append(project.pk)
+                self.stdout.write(f"Built variants for: {project.title}")
+        # update() skips the save signals; refresh the cached and
+        # pre-rendered pages once for the whole batch.
+        refresh_project_pages(built)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\nBuilt image variants for {len(built)} projects")
+        )
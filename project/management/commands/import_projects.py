@@ -0,0 +1,48 @@
+import sys
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from project.transfer import FORMATS, file_format, import_projects
+
+
+class Command(BaseCommand):
+    help = "Upsert projects from a JSONL or CSV file written by export_projects"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", nargs="?", default="-", help="Input file, or - for stdin"
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Defaults to the file extension, or jsonl",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or file_format(path)
+        try:
+            if path == "-":
+                result = import_projects(sys.stdin.buffer, fmt)
+            else:
+                with open(path, "rb") as source:
+                    result = import_projects(source, fmt)
+        except (ValueError, DatabaseError) as exc:
+            raise CommandError(f"Import failed, nothing was changed: {exc}") from exc
+        # The import bypasses the save signals that drop cached pages.
+        cache.clear()
+
+        for name in result.missing_images:
+            self.stderr.write(f"Missing image file: {name}")
+        if result.missing_images:
+            self.stderr.write(
+                "Copy the files above into MEDIA_ROOT, then run"
+                " generate_image_variants."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Read {result.read} projects, {result.changed} inserted or changed"
+            )
+        )
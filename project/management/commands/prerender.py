@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from project.prerender import prerender_project, prerender_site
+
+
+class Command(BaseCommand):
+    help = "Render the public pages to static HTML files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.PRERENDER_ROOT,
+            help="Directory to write to; defaults to PRERENDER_ROOT",
+        )
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            metavar="PK",
+            help="Only render the pages a change to this project affects",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Render every page, even those whose version has not changed",
+        )
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            raise CommandError("Pass --output or set PRERENDER_ROOT")
+        root = Path(options["output"])
+        if options["project"]:
+            results = [
+                async_to_sync(prerender_project)(root, pk) for pk in options["project"]
+            ]
+        else:
+            results = [async_to_sync(prerender_site)(root, force=options["force"])]
+
+        rendered = sum(result.rendered for result in results)
+        written = sum(result.written for result in results)
+        skipped = sum(result.skipped for result in results)
+        removed = sum(result.removed for result in results)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {rendered} pages into {root}: {written} changed,"
+                f" {skipped} up to date, {removed} removed"
+            )
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from project.models import Project
+from project.signals import refresh_project_pages
+from project.text import TEXT_FIELDS, render_project_text
+
+
+class Command(BaseCommand):
+    help = "Render description/challenge/key_features to their stored HTML"
+
+    def handle(self, *args, **options):
+        projects = Project.objects.only(
+            "pk", "title", *TEXT_FIELDS, *(f"{field}_html" for field in TEXT_FIELDS)
+        )
+        rendered = []
+        for project in projects.iterator():
+            changed = render_project_text(project)
+            if not changed:
+                continue
+            # update() skips the save signals; bump updated_at by hand so the
+            # detail page ETag changes.
+            Project.objects.filter(pk=project.pk).update(
+                updated_at=timezone.now(),
+                **{name: getattr(project, name) for name in changed},
+            )
+            rendered.append(project.pk)
+            self.stdout.write(f"Rendered text for: {project.title}")
+        # Then refresh the cached and pre-rendered pages once, as a save would.
+        refresh_project_pages(rendered)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\nRendered text for {len(rendered)} projects")
+        )
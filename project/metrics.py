@@ -0,0 +1,116 @@
+from django.db import connections
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+PAGE_CACHE_REQUESTS = Counter(
+    "project_page_cache_requests_total",
+    "Full-page cache lookups for the public views, by view and result.",
+    ["view", "result"],
+)
+
+CACHE_REQUESTS = Counter(
+    "project_cache_requests_total",
+    "Lookups in the two-tier cache, by tier and result (hit, stale or miss).",
+    ["tier", "result"],
+)
+
+# Per-view cost of a request, recorded by project.instrumentation. The view
+# label is the resolved URL name, so its cardinality is bounded by the URLconf.
+_SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+VIEW_QUERIES = Histogram(
+    "project_view_queries",
+    "Database queries run while handling a request, by view.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+VIEW_DB_SECONDS = Histogram(
+    "project_view_db_seconds",
+    "Time spent executing database queries per request, by view.",
+    ["view"],
+    buckets=_SECONDS_BUCKETS,
+)
+VIEW_RENDER_SECONDS = Histogram(
+    "project_view_render_seconds",
+    "Time spent rendering templates per request, by view.",
+    ["view"],
+    buckets=_SECONDS_BUCKETS,
+)
+VIEW_RESPONSE_BYTES = Histogram(
+    "project_view_response_bytes",
+    "Size of the response body, by view.",
+    ["view"],
+    buckets=tuple(1024 * 2**power for power in range(11)),
+)
+
+
+def database_pools() -> dict:
+    """The psycopg pool of every database with pooling on, by alias."""
+    pools = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            pools[alias] = pool
+    return pools
+
+
+class DatabasePoolCollector(Collector):
+    """Reads psycopg pool statistics at scrape time.
+
+    The pool keeps its own running totals, so nothing is recorded on the
+    request path.
+    """
+
+    def __init__(self, pools=database_pools):
+        self.pools = pools
+
+    def describe(self):
+        # Nothing to check for clashes, and describing must not open a pool.
+        return []
+
+    def collect(self):
+        held = GaugeMetricFamily(
+            "project_db_pool_connections",
+            "Connections held by the pool, by database and state.",
+            labels=["database", "state"],
+        )
+        max_size = GaugeMetricFamily(
+            "project_db_pool_max_size",
+            "Connections the pool may open, by database.",
+            labels=["database"],
+        )
+        waiting = GaugeMetricFamily(
+            "project_db_pool_waiting",
+            "Checkouts waiting for a free connection, by database.",
+            labels=["database"],
+        )
+        checkouts = CounterMetricFamily(
+            "project_db_pool_checkouts",
+            "Connections requested from the pool, by database.",
+            labels=["database"],
+        )
+        wait_seconds = CounterMetricFamily(
+            "project_db_pool_wait_seconds",
+            "Time checkouts spent waiting for a connection, by database.",
+            labels=["database"],
+        )
+        failures = CounterMetricFamily(
+            "project_db_pool_checkout_failures",
+            "Checkouts that got no connection, by database; mostly timeouts.",
+            labels=["database"],
+        )
+        for alias, pool in self.pools().items():
+            stats = pool.get_stats()
+            size, available = stats.get("pool_size", 0), stats.get("pool_available", 0)
+            held.add_metric([alias, "in_use"], size - available)
+            held.add_metric([alias, "idle"], available)
+            max_size.add_metric([alias], stats.get("pool_max", 0))
+            waiting.add_metric([alias], stats.get("requests_waiting", 0))
+            checkouts.add_metric([alias], stats.get("requests_num", 0))
+            wait_seconds.add_metric([alias], stats.get("requests_wait_ms", 0) / 1000)
+            failures.add_metric([alias], stats.get("requests_errors", 0))
+        yield from (held, max_size, waiting, checkouts, wait_seconds, failures)
+
+
+REGISTRY.register(DatabasePoolCollector())
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:05
+
+import re
+
+from django.db import migrations
+
+
+def populate_tags(apps, schema_editor):
+    Project = apps.get_model("project", "Project")
+    Tag = apps.get_model("project", "Tag")
+    ProjectTag = apps.get_model("project", "ProjectTag")
+
+    # Project.stack is as long as Tag.name, so every token should fit; one
+    # that does not is skipped rather than failing the migration.
+    max_length = Tag._meta.get_field("name").max_length
+    stacks = {}
+    for pk, stack in Project.objects.values_list("pk", "stack"):
+        names = (name.strip().upper() for name in re.split(r"[\s,]+", stack))
+        stacks[pk] = list(
+            dict.fromkeys(name for name in names if 0 < len(name) <= max_length)
+        )
+
+    all_names = {name for names in stacks.values() for name in names}
+    Tag.objects.bulk_create(
+        [Tag(name=name) for name in sorted(all_names)], ignore_conflicts=True
+    )
+    tag_ids = dict(Tag.objects.values_list("name", "id"))
+    ProjectTag.objects.bulk_create(
+        [
+            ProjectTag(project_id=pk, tag_id=tag_ids[name], position=position)
+            for pk, names in stacks.items()
+            for position, name in enumerate(names)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0005_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+    ]
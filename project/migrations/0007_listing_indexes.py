@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0006_populate_tags'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='project',
+            options={'ordering': ['-year', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['category', '-year', '-id'], include=('updated_at',), name='project_category_year_id'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-year', '-id'], include=('updated_at',), name='project_year_id'),
+        ),
+    ]
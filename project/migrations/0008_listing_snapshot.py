@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0007_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingSnapshot',
+            fields=[
+                ('category', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=1)),
+                ('page_size', models.PositiveSmallIntegerField()),
+                ('cards', models.JSONField(default=list)),
+                ('payload', models.BinaryField()),
+                ('next_cursor', models.CharField(blank=True, max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
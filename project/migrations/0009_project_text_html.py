@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:14
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+
+
+def render_text_html(apps, schema_editor):
+    # Default "linebreaks" format; with PROJECT_TEXT_FORMAT=markdown, run
+    # manage.py render_project_text afterwards.
+    Project = apps.get_model("project", "Project")
+    projects = list(
+        Project.objects.only("pk", "challenge", "key_features", "description")
+    )
+    for project in projects:
+        project.challenge_html = linebreaks(project.challenge, autoescape=True)
+        project.key_features_html = linebreaks(project.key_features, autoescape=True)
+        project.description_html = linebreaks(project.description, autoescape=True)
+    Project.objects.bulk_update(
+        projects,
+        ["challenge_html", "key_features_html", "description_html"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0008_listing_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='challenge_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='key_features_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_text_html, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0009_project_text_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listingsnapshot',
+            name='schema',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:05
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0011_listing_snapshot_schema'),
+    ]
+
+    operations = [
+        # Added nullable and filled in SQL: a Python default would give every
+        # existing row the same value.
+        migrations.AddField(
+            model_name='project',
+            name='uuid',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            "UPDATE project_project SET uuid = gen_random_uuid()",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0012_project_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='featured',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='featured_order',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        # Keep the home page showing what the hard-coded id__in=[1, 2] did.
+        migrations.RunSQL(
+            "UPDATE project_project SET featured = true, featured_order = id"
+            " WHERE id IN (1, 2)",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('featured', True)), fields=['featured_order', '-year', '-id'], name='project_featured'),
+        ),
+    ]
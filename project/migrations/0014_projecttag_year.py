@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0013_project_featured'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projecttag',
+            name='year',
+            field=models.PositiveIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            "UPDATE project_projecttag pt SET year = p.year"
+            " FROM project_project p WHERE p.id = pt.project_id",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='projecttag',
+            index=models.Index(fields=['tag', '-year', '-project'], name='project_tag_tag_year'),
+        ),
+        migrations.RemoveIndex(
+            model_name='projecttag',
+            name='project_tag_tag_project',
+        ),
+    ]
@@ -1,4 +1,21 @@
+import re
+from uuid import uuid4
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models import (
+    F,
+    FilteredRelation,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+)
+
+SEARCH_CONFIG = "english"
 
 PROJECT_CATEGORIES = {
     "WEB_DEV": "Web Development",
@@ -6,8 +23,115 @@ PROJECT_CATEGORIES = {
     "TALK": "Talk",
 }
 
+# Columns the home and listing cards render; see project.listing.
+LISTING_FIELDS = (
+    "id",
+    "title",
+    "category",
+    "year",
+    "short_summary",
+    "image",
+    "image_variants",
+)
+
+
+class ProjectQuerySet(models.QuerySet):
+    def featured(self):
+        return self.filter(featured=True).order_by("featured_order", "-year", "-id")
+
+    def for_category(self, category: str | None):
+        if category and category != "all":
+            return self.filter(category=category)
+        return self.all()
+
+    def with_tag(self, tag: str | None):
+        """Projects tagged ``tag``, sorted and paged by their ProjectTag row.
+
+        The row's copy of (year, project) is aliased as TAGGED_KEYS; ordering
+        on it walks the tag's slice of ``project_tag_tag_year`` newest first,
+        instead of sorting every tagged project to find the first page.
+        """
+        if not tag:
+            return self.all()
+        tag_id = Tag.objects.filter(name=normalize_tag(tag)).order_by().values("pk")
+        year, project = TAGGED_KEYS
+        # Filtering on the aliases, not on ``tagged`` itself, keeps every
+        # condition on the one join.
+        return (
+            self.annotate(
+                tagged=FilteredRelation(
+                    "project_tags", condition=Q(project_tags__tag=Subquery(tag_id))
+                )
+            )
+            .alias(**{year: F("tagged__year"), project: F("tagged__project")})
+            .filter(**{f"{project}__isnull": False})
+        )
+
+    def with_tag_names(self):
+        """Annotate ``tag_names``, the project's tags in ``stack`` order.
+
+        The correlated subquery only runs for the rows that survive the
+        LIMIT of a page.
+        """
+        tag_names = ArraySubquery(
+            ProjectTag.objects.filter(project=OuterRef("pk"))
+            .order_by("position")
+            .values("tag__name")
+        )
+        return self.annotate(tag_names=tag_names)
+
+    def listing(self):
+        """Named rows with only the card columns, skipping the long text fields.
+
+        ``updated_at`` comes along to version the page; see
+        project.conditional.project_list_etag.
+        """
+        return self.with_tag_names().values_list(
+            *LISTING_FIELDS, "tag_names", "updated_at", named=True
+        )
+
+    def with_tags(self):
+        return self.prefetch_related(
+            Prefetch("project_tags", queryset=ProjectTag.objects.select_related("tag"))
+        )
+
+
+# The (year, id) sort keys of a listing; see sort_keys.
+LISTING_KEYS = ("year", "id")
+TAGGED_KEYS = ("tagged_year", "tagged_project")
+
+
+def sort_keys(queryset: QuerySet) -> tuple[str, str]:
+    """The (year, id) fields ``queryset`` is ordered and paged by, newest first."""
+    if TAGGED_KEYS[0] in queryset.query.annotations:
+        return TAGGED_KEYS
+    return LISTING_KEYS
+
+
+def normalize_tag(name: str) -> str:
+    return name.strip().upper()
+
+
+def parse_stack(stack: str) -> list[str]:
+    """Split a stack string on whitespace or commas, keeping first-seen order."""
+    names = (normalize_tag(name) for name in re.split(r"[\s,]+", stack))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class Tag(models.Model):
+    # As long as Project.stack, so a stack without separators still fits.
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return str(self.name)
+
 
 class Project(models.Model):
+    # Stable across databases, unlike ``id``; export/import match rows on it.
+    uuid = models.UUIDField(default=uuid4, unique=True, editable=False)
     title = models.CharField(max_length=100)
     category = models.CharField(max_length=100, choices=PROJECT_CATEGORIES)
     short_summary = models.TextField()
@@ -15,13 +139,162 @@ class Project(models.Model):
     role = models.CharField(max_length=100)
     year = models.PositiveIntegerField()
     stack = models.CharField(max_length=100)
+    # Derived from ``stack`` on save; see Project.sync_tags.
+    tags = models.ManyToManyField(
+        Tag, through="ProjectTag", related_name="projects", blank=True
+    )
     repository = models.URLField(blank=True)
 
+    # Shown on the home page, lowest featured_order first.
+    featured = models.BooleanField(default=False)
+    featured_order = models.PositiveSmallIntegerField(default=0)
+
     challenge = models.TextField()
     key_features = models.TextField()
     description = models.TextField()
+    # Rendered from the fields above on save; see project.text.
+    challenge_html = models.TextField(blank=True, editable=False)
+    key_features_html = models.TextField(blank=True, editable=False)
+    description_html = models.TextField(blank=True, editable=False)
 
     image = models.ImageField(upload_to="projects/")
+    # Resized AVIF/WebP copies of ``image``, maintained by project.images.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Computed by PostgreSQL on every write, including bulk inserts and COPY.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("short_summary", "stack", weight="B", config=SEARCH_CONFIG)
+            + SearchVector(
+                "challenge", "key_features", weight="C", config=SEARCH_CONFIG
+            )
+            + SearchVector("description", weight="D", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-year", "-id"]
+        indexes = [
+            # Listing pages walk these in keyset order. updated_at rides along
+            # so the ETag aggregate for a category can be an index-only scan.
+            models.Index(
+                fields=["category", "-year", "-id"],
+                include=["updated_at"],
+                name="project_category_year_id",
+            ),
+            models.Index(
+                fields=["-year", "-id"],
+                include=["updated_at"],
+                name="project_year_id",
+            ),
+            GinIndex(fields=["search_vector"], name="project_search_vector_gin"),
+            # Only the handful of featured rows, in home page order.
+            models.Index(
+                fields=["featured_order", "-year", "-id"],
+                condition=models.Q(featured=True),
+                name="project_featured",
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.title)
+
+    def save(self, *args, update_fields=None, **kwargs) -> None:
+        if update_fields is not None:
+            # The pre_save receiver re-renders ``*_html`` from the text it
+            # was given; a partial save has to write those columns too.
+            update_fields = {
+                *update_fields,
+                *(
+                    f"{name}_html"
+                    for name in update_fields
+                    if hasattr(type(self), f"{name}_html")
+                ),
+            }
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    @property
+    def stack_tags(self) -> list[Tag]:
+        """Tags in the order they appear in ``stack``.
+
+        Prefetch with ``Project.objects.with_tags()`` to avoid a query per row.
+        """
+        return [project_tag.tag for project_tag in self.project_tags.all()]
+
+    def sync_tags(self) -> None:
+        names = parse_stack(self.stack)
+        current = list(
+            self.project_tags.order_by("position").values_list("tag__name", "year")
+        )
+        if [name for name, _year in current] == names:
+            if any(year != self.year for _name, year in current):
+                ProjectTag.objects.filter(project=self).update(year=self.year)
+            return
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in names], ignore_conflicts=True
+        )
+        tag_ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+        ProjectTag.objects.filter(project=self).delete()
+        ProjectTag.objects.bulk_create(
+            ProjectTag(
+                project=self, tag_id=tag_ids[name], position=position, year=self.year
+            )
+            for position, name in enumerate(names)
+        )
+
+
+class ProjectTag(models.Model):
+    # The unique constraint and the composite index below cover both
+    # directions, so the per-column FK indexes would only cost writes.
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="project_tags", db_index=False
+    )
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, related_name="project_tags", db_index=False
+    )
+    position = models.PositiveSmallIntegerField(default=0)
+    # Project.year, copied so a tag's projects can be read newest first from
+    # the index below; see ProjectQuerySet.with_tag.
+    year = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "tag"], name="project_tag_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["tag", "-year", "-project"], name="project_tag_tag_year"
+            ),
+        ]
+
+
+class ListingSnapshot(models.Model):
+    """The first listing page of one category, materialized on every write.
+
+    ``payload`` is the page's ``projects_json``, serialized once by
+    project.listing and served as stored. ``version`` goes up on each rebuild
+    and stands in for the listing's ETag.
+    """
+
+    category = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=1)
+    page_size = models.PositiveSmallIntegerField()
+    # Digest of the ProjectCard fields the cards were written with.
+    schema = models.CharField(max_length=16, blank=True)
+    cards = models.JSONField(default=list)
+    payload = models.BinaryField()
+    next_cursor = models.CharField(max_length=100, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.category} v{self.version}"
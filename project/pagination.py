@@ -0,0 +1,104 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from django.db.models import Q, QuerySet
+
+from .models import Project, sort_keys
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class CursorKey(Protocol):
+    """The (year, id) sort key carried by cards and listing rows."""
+
+    @property
+    def year(self) -> int: ...
+
+    @property
+    def id(self) -> int: ...
+
+
+@dataclass
+class KeysetPage:
+    items: list[Any]
+    next_cursor: str | None
+    previous_cursor: str | None
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(project: Project | CursorKey, direction: str) -> str:
+    raw = json.dumps([project.year, project.id, direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[int, int, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        year, pk, direction = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not (type(year) is int and type(pk) is int and direction in (NEXT, PREVIOUS)):
+        raise InvalidCursor(cursor)
+    return year, pk, direction
+
+
+def page_queryset(
+    queryset: QuerySet[Project], cursor: str | None, page_size: int
+) -> tuple[QuerySet[Project], str | None]:
+    """Return the query for the page ``cursor`` points at, plus its direction.
+
+    The query fetches one row more than ``page_size`` so the caller can tell
+    whether another page follows. Previous pages come back in ascending order.
+    """
+    year_key, id_key = sort_keys(queryset)
+    if not cursor:
+        return queryset.order_by(f"-{year_key}", f"-{id_key}")[: page_size + 1], None
+
+    year, pk, direction = decode_cursor(cursor)
+    # The redundant year bound gives PostgreSQL an index condition to seek
+    # to; the OR alone would only filter rows from the start of the index.
+    if direction == NEXT:
+        page = queryset.filter(
+            Q(**{f"{year_key}__lte": year}),
+            Q(**{f"{year_key}__lt": year}) | Q(**{year_key: year, f"{id_key}__lt": pk}),
+        ).order_by(f"-{year_key}", f"-{id_key}")
+    else:
+        page = queryset.filter(
+            Q(**{f"{year_key}__gte": year}),
+            Q(**{f"{year_key}__gt": year}) | Q(**{year_key: year, f"{id_key}__gt": pk}),
+        ).order_by(year_key, id_key)
+    return page[: page_size + 1], direction
+
+
+async def keyset_page(
+    queryset: QuerySet[Project], cursor: str | None, page_size: int
+) -> KeysetPage:
+    """Return one page of ``queryset`` ordered newest first by (year, id).
+
+    Pages are addressed by the key of the row next to them rather than an
+    offset, so every page costs a single range scan of ``page_size + 1`` rows.
+    """
+    page, direction = page_queryset(queryset, cursor, page_size)
+    rows = [project async for project in page]
+    more = len(rows) > page_size
+    if direction == PREVIOUS:
+        items = rows[:page_size][::-1]
+        has_next, has_previous = True, more
+    else:
+        items = rows[:page_size]
+        has_next, has_previous = more, direction == NEXT
+
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(items[-1], NEXT) if items and has_next else None,
+        previous_cursor=(
+            encode_cursor(items[0], PREVIOUS) if items and has_previous else None
+        ),
+    )
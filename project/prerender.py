@@ -0,0 +1,243 @@
+"""Render the public pages to static HTML for a file server to answer.
+
+Each page is written as ``index.html`` under its URL path: the home page,
+``projects/``, one ``projects/category/<category>/`` per listing variant and
+``projects/<pk>/`` per project. Only snapshot pages are written; cursor and
+tag pages and search stay with Django.
+
+Files are replaced atomically and only when their bytes change. A full run
+records the version of every page, the same values its ETag is built from,
+in ``.prerender.json`` and renders again only the pages whose version moved.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from inspect import unwrap
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpRequest, QueryDict
+
+from . import views
+from .conditional import _templates_digest
+from .listing import featured_projects, listing_snapshot
+from .models import PROJECT_CATEGORIES, Project
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = ".prerender.json"
+
+_BATCH_SIZE = 1_000
+
+
+@dataclass(slots=True)
+class Page:
+    # Relative to the output directory.
+    path: str
+    request: HttpRequest
+    view: Callable
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class PrerenderResult:
+    rendered: int = 0
+    # Rendered and different from the file on disk.
+    written: int = 0
+    # Left alone because their version had not changed.
+    skipped: int = 0
+    removed: int = 0
+
+
+def _request(path: str, **query: str) -> HttpRequest:
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = path
+    request.GET = QueryDict(mutable=True)
+    request.GET.update(query)
+    request.user = AnonymousUser()
+    return request
+
+
+def home_page() -> Page:
+    return Page("index.html", _request("/"), views.home)
+
+
+def listing_pages() -> list[Page]:
+    pages = [Page("projects/index.html", _request("/projects/"), views.project_list)]
+    for category in ("all", *PROJECT_CATEGORIES):
+        pages.append(
+            Page(
+                f"projects/category/{category}/index.html",
+                _request("/projects/", category=category),
+                views.project_list,
+            )
+        )
+    return pages
+
+
+def detail_page(pk: int) -> Page:
+    return Page(
+        f"projects/{pk}/index.html",
+        _request(f"/projects/{pk}/"),
+        views.project_detail,
+        {"pk": pk},
+    )
+
+
+async def render_page(page: Page) -> bytes | None:
+    """The page's HTML, or ``None`` when it does not exist (any more).
+
+    The view runs without the page cache and conditional GET decorators, so
+    the output is always freshly rendered.
+    """
+    try:
+        response = await unwrap(page.view)(page.request, **page.kwargs)
+    except Http404:
+        return None
+    if response.status_code != 200:
+        return None
+    return response.content
+
+
+def write_file(path: Path, content: bytes) -> bool:
+    """Atomically replace ``path`` with ``content``; returns whether it changed."""
+    try:
+        if path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(content)
+        # mkstemp creates the file readable by its owner only.
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return True
+
+
+def remove_file(path: Path) -> bool:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        return False
+    try:
+        path.parent.rmdir()
+    except OSError:
+        pass
+    return True
+
+
+async def _prerender(root: Path, page: Page, result: PrerenderResult) -> None:
+    content = await render_page(page)
+    result.rendered += 1
+    if content is None:
+        result.removed += remove_file(root / page.path)
+    elif write_file(root / page.path, content):
+        result.written += 1
+
+
+async def _versioned_pages():
+    """Every public page, with the version it would be rendered at."""
+    page = home_page()
+    yield page, (await featured_projects()).version
+    for page in listing_pages():
+        category = page.request.GET.get("category", "all")
+        # Memoized on the request, so the view reuses it.
+        snapshot = await listing_snapshot(page.request, category)
+        yield page, str(snapshot.version)
+    rows = Project.objects.order_by("pk").values_list("pk", "updated_at")
+    last = 0
+    while batch := [row async for row in rows.filter(pk__gt=last)[:_BATCH_SIZE]]:
+        for pk, updated in batch:
+            yield detail_page(pk), str(int(updated.timestamp() * 1_000_000))
+        last = batch[-1][0]
+
+
+def _read_manifest(root: Path) -> dict[str, str]:
+    try:
+        manifest = json.loads((root / MANIFEST).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+    # Pages rendered from other templates are all out of date.
+    if manifest.get("templates") != _templates_digest():
+        return {}
+    return manifest.get("pages", {})
+
+
+async def prerender_site(root: Path, force: bool = False) -> PrerenderResult:
+    """Bring every page under ``root`` up to date.
+
+    Pages whose version matches the manifest are skipped unless ``force``;
+    detail pages of deleted projects are removed.
+    """
+    result = PrerenderResult()
+    previous = {} if force else _read_manifest(root)
+    versions = {}
+    async for page, version in _versioned_pages():
+        versions[page.path] = version
+        if previous.get(page.path) == version and (root / page.path).exists():
+            result.skipped += 1
+            continue
+        await _prerender(root, page, result)
+
+    projects = root / "projects"
+    if projects.is_dir():
+        for directory in projects.iterdir():
+            path = f"projects/{directory.name}/index.html"
+            if directory.name.isdigit() and path not in versions:
+                result.removed += remove_file(root / path)
+
+    write_file(
+        root / MANIFEST,
+        json.dumps({"templates": _templates_digest(), "pages": versions}).encode(),
+    )
+    return result
+
+
+async def prerender_project(root: Path, pk: int) -> PrerenderResult:
+    """Render the pages a write to project ``pk`` can change.
+
+    Home and every listing variant, as for the page cache, plus the
+    project's own page, which is removed if the project is gone. The
+    manifest is left to the next full run, which then finds the files
+    already current.
+    """
+    result = PrerenderResult()
+    for page in (home_page(), *listing_pages(), detail_page(pk)):
+        await _prerender(root, page, result)
+    return result
+
+
+def rerender_project(pk: int) -> None:
+    """``prerender_project`` into ``PRERENDER_ROOT``, after a committed write.
+
+    Failures are logged, not raised: the write itself succeeded, and the
+    next full run renders the pages it missed.
+    """
+    try:
+        async_to_sync(prerender_project)(Path(settings.PRERENDER_ROOT), pk)
+    except Exception:
+        logger.exception("Re-rendering the pages of project %s failed", pk)
+
+
+def rerender_site() -> None:
+    """``prerender_site`` into ``PRERENDER_ROOT``, after a bulk write.
+
+    Only the pages whose version moved are rendered. Failures are logged,
+    as in ``rerender_project``.
+    """
+    try:
+        async_to_sync(prerender_site)(Path(settings.PRERENDER_ROOT))
+    except Exception:
+        logger.exception("Re-rendering the site failed")
@@ -0,0 +1,61 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, QuerySet, TextField, Value
+from django.db.models.functions import Concat
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+from .models import SEARCH_CONFIG, Project
+
+# ts_headline marks matches with these; the text is HTML-escaped before they
+# are swapped for <mark> tags, so project content cannot inject markup.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+
+def search_query(terms: str) -> SearchQuery:
+    return SearchQuery(terms, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def matching(queryset: QuerySet[Project], terms: str) -> QuerySet[Project]:
+    return queryset.filter(search_vector=search_query(terms))
+
+
+def ranked_search(queryset: QuerySet[Project], terms: str) -> QuerySet[Project]:
+    query = search_query(terms)
+    return (
+        queryset.filter(search_vector=query)
+        .defer(
+            "challenge",
+            "key_features",
+            "description",
+            "challenge_html",
+            "key_features_html",
+            "description_html",
+        )
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            headline=SearchHeadline(
+                Concat(
+                    "short_summary",
+                    Value(" "),
+                    "description",
+                    output_field=TextField(),
+                ),
+                query,
+                config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=35,
+                min_words=15,
+            ),
+        )
+        .order_by("-rank", "-year", "-id")
+    )
+
+
+def highlight(headline: str) -> SafeString:
+    return mark_safe(
+        escape(headline)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
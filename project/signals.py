@@ -0,0 +1,58 @@
+from collections.abc import Collection
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_project_pages
+from .images import refresh_variants
+from .listing import forget_featured_projects, rebuild_listing_snapshots
+from .models import Project
+from .prerender import rerender_project, rerender_site
+from .text import render_project_text
+
+
+@receiver(pre_save, sender=Project)
+def render_text_fields(sender, instance: Project, **kwargs) -> None:
+    render_project_text(instance)
+
+
+@receiver(post_save, sender=Project)
+def build_image_variants(sender, instance: Project, raw: bool, **kwargs) -> None:
+    if not raw:
+        # The save has just set updated_at and refreshes the pages on commit.
+        refresh_variants(instance, touch=False)
+
+
+@receiver(post_save, sender=Project)
+def sync_stack_tags(sender, instance: Project, raw: bool, **kwargs) -> None:
+    if not raw:
+        instance.sync_tags()
+
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_cached_pages(sender, instance: Project, **kwargs) -> None:
+    # Wait for the commit so a concurrent request cannot re-cache the old row.
+    pk = instance.pk
+    transaction.on_commit(lambda: refresh_project_pages([pk]))
+
+
+def refresh_project_pages(pks: Collection[int]) -> None:
+    """Bring every copy of the pages showing ``pks`` up to date.
+
+    Run on commit after a save or delete, and by the commands that write
+    with ``update()`` or in bulk and so skip the signals.
+    """
+    if not pks:
+        return
+    # Snapshots first: a page cached after the invalidation must already
+    # be rendered from the new snapshot.
+    rebuild_listing_snapshots()
+    forget_featured_projects()
+    invalidate_project_pages(*pks)
+    if settings.PRERENDER_ROOT:
+        if len(pks) == 1:
+            rerender_project(next(iter(pks)))
+        else:
+            rerender_site()
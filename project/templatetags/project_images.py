@@ -0,0 +1,36 @@
+from django import template
+
+from project.images import VARIANT_FORMATS
+from project.listing import ProjectCard
+from project.models import Project
+
+register = template.Library()
+
+
+@register.inclusion_tag("components/responsive_image.html")
+def responsive_image(
+    project: Project | ProjectCard,
+    sizes: str,
+    css_class: str = "",
+    loading: str = "lazy",
+) -> dict:
+    # Listing cards carry the bare file name rather than an ImageFieldFile.
+    storage = Project._meta.get_field("image").storage
+    sources = [
+        {
+            "type": f"image/{fmt}",
+            "srcset": ", ".join(
+                f"{storage.url(name)} {width}w" for width, name in variants
+            ),
+        }
+        for fmt in VARIANT_FORMATS
+        if (variants := project.image_variants.get(fmt))
+    ]
+    return {
+        "project": project,
+        "src": storage.url(str(project.image)),
+        "sources": sources,
+        "sizes": sizes,
+        "css_class": css_class,
+        "loading": loading,
+    }
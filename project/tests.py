@@ -1,9 +1,53 @@
+import asyncio
+import gzip
+import inspect
 import json
+import pickle
+import random
+import time
+from io import BytesIO, StringIO
 
+import brotli
 import pytest
+from asgiref.sync import SyncToAsync, async_to_sync
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import CsrfViewMiddleware, get_token
+from django.template import engines
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-
-from project.models import PROJECT_CATEGORIES
+from PIL import Image
+from prometheus_client import REGISTRY
+from psycopg_pool import ConnectionPool, PoolTimeout
+
+from core import compression, tiered_cache, warmup
+from core.assets import minify_css, purge_css
+from project import api, text, views
+from project.cache import cache_tier_hit_ratio, page_cache_hit_ratio
+from project.images import VARIANT_WIDTHS, available_formats, variant_name
+from project.listing import (
+    CARD_SCHEMA,
+    ProjectCard,
+    dumps,
+    rebuild_listing_snapshots,
+)
+from project.management.commands.seed_data import synthetic_projects
+from project.metrics import DatabasePoolCollector
+from project.models import (
+    PROJECT_CATEGORIES,
+    ListingSnapshot,
+    Project,
+    Tag,
+    parse_stack,
+)
+from project.pagination import NEXT, PREVIOUS, encode_cursor, page_queryset
+from project.prerender import prerender_site
 
 
 @pytest.mark.django_db
@@ -62,7 +106,50 @@ def test_home_view_featured_projects(client, web_dev_project, sys_design_project
     response = client.get(url)
     assert "featured_projects" in response.context
     featured_projects = response.context["featured_projects"]
-    assert featured_projects.count() >= 0
+    assert len(featured_projects) >= 0
+
+
+@pytest.mark.django_db
+def test_home_shows_featured_projects_in_order(client, create_project):
+    """Test only featured projects appear, lowest featured_order first."""
+    create_project(title="Hidden")
+    second = create_project(title="Second", featured=True, featured_order=2)
+    first = create_project(title="First", featured=True, featured_order=1)
+
+    cards = client.get(reverse("home")).context["featured_projects"]
+
+    assert [card.id for card in cards] == [first.pk, second.pk]
+
+
+@pytest.mark.django_db
+def test_home_is_served_from_the_featured_cache(
+    client, django_assert_num_queries, create_project
+):
+    """Test a warm featured cache answers the home page without queries."""
+    create_project(featured=True)
+    client.get(reverse("home"))
+    cache.clear()
+
+    with django_assert_num_queries(0):
+        response = client.get(reverse("home"))
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_project_write_refreshes_the_featured_cache(
+    client, create_project, django_capture_on_commit_callbacks
+):
+    """Test featuring a project shows it on the next home page."""
+    project = create_project(title="Newly Featured")
+    assert client.get(reverse("home")).context["featured_projects"] == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        project.featured = True
+        project.save()
+
+    cards = client.get(reverse("home")).context["featured_projects"]
+    assert [card.id for card in cards] == [project.pk]
 
 
 # ============================================================================
@@ -93,11 +180,11 @@ def test_project_list_view_displays_all_projects(
     """Test project list view displays all projects without filter."""
     url = reverse("projects")
     response = client.get(url)
-    projects = response.context["projects"]
-    assert projects.count() == 3
-    assert web_dev_project in projects
-    assert sys_design_project in projects
-    assert talk_project in projects
+    project_ids = [p.id for p in response.context["projects"]]
+    assert len(project_ids) == 3
+    assert web_dev_project.id in project_ids
+    assert sys_design_project.id in project_ids
+    assert talk_project.id in project_ids
 
 
 @pytest.mark.django_db
@@ -117,7 +204,7 @@ def test_project_list_view_filter_by_category(
     url = reverse("projects")
     response = client.get(url, {"category": category})
     projects = response.context["projects"]
-    assert projects.count() == expected_count
+    assert len(projects) == expected_count
 
 
 @pytest.mark.django_db
@@ -128,8 +215,8 @@ def test_project_list_view_filter_web_dev_category(
     url = reverse("projects")
     response = client.get(url, {"category": "WEB_DEV"})
     projects = response.context["projects"]
-    assert projects.count() == 1
-    assert projects.first() == web_dev_project
+    assert len(projects) == 1
+    assert projects[0].id == web_dev_project.id
 
 
 @pytest.mark.django_db
@@ -140,8 +227,8 @@ def test_project_list_view_filter_sys_design_category(
     url = reverse("projects")
     response = client.get(url, {"category": "SYS_DESIGN"})
     projects = response.context["projects"]
-    assert projects.count() == 1
-    assert projects.first() == sys_design_project
+    assert len(projects) == 1
+    assert projects[0].id == sys_design_project.id
 
 
 @pytest.mark.django_db
@@ -196,7 +283,34 @@ def test_project_list_view_empty_projects(client):
     url = reverse("projects")
     response = client.get(url)
     projects = response.context["projects"]
-    assert projects.count() == 0
+    assert len(projects) == 0
+
+
+@pytest.mark.django_db
+def test_project_list_grid_fragment_skips_the_layout(client, web_dev_project):
+    """Test ?fragment=grid renders only the grid partial, without projects_json."""
+    response = client.get(reverse("projects"), {"fragment": "grid"})
+
+    templates = [t.name for t in response.templates]
+    assert templates[0] == "components/project_grid.html"
+    assert "layouts/base.html" not in templates
+    assert response.content.lstrip().startswith(b"<!--")
+    assert b'id="project-grid"' in response.content
+    assert b"projects-data" not in response.content
+    assert web_dev_project.title.encode() in response.content
+
+
+@pytest.mark.django_db
+def test_project_list_page_includes_the_same_grid(client, create_project):
+    """Test the full page embeds the markup the fragment swaps in."""
+    project = create_project(category="TALK", image="")
+    url = reverse("projects")
+    fragment = client.get(url, {"category": "TALK", "fragment": "grid"})
+    page = client.get(url, {"category": "TALK"})
+
+    assert fragment.content.strip() in page.content
+    # The placeholder shown for projects without an image.
+    assert f"PROJECT_{project.id:02d}</span".encode() in fragment.content
 
 
 # ============================================================================
@@ -331,13 +445,2049 @@ def test_projects_filter_persistence(
 ):
     """Test that filtering works correctly across different categories."""
     response = client.get(reverse("projects"), {"category": "WEB_DEV"})
-    assert response.context["projects"].count() == 1
+    assert len(response.context["projects"]) == 1
     assert response.context["current_filter"] == "WEB_DEV"
 
     response = client.get(reverse("projects"), {"category": "SYS_DESIGN"})
-    assert response.context["projects"].count() == 1
+    assert len(response.context["projects"]) == 1
     assert response.context["current_filter"] == "SYS_DESIGN"
 
     response = client.get(reverse("projects"), {"category": "all"})
-    assert response.context["projects"].count() == 3
+    assert len(response.context["projects"]) == 3
     assert response.context["current_filter"] == "all"
+
+
+# ============================================================================
+# PAGE CACHE TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name,params",
+    [
+        ("home", {}),
+        ("projects", {}),
+        ("projects", {"category": "WEB_DEV"}),
+    ],
+)
+def test_repeat_request_is_served_from_cache(
+    client, django_assert_num_queries, web_dev_project, url_name, params
+):
+    """Test a second request for the same page runs no queries."""
+    url = reverse(url_name)
+    first = client.get(url, params)
+
+    with django_assert_num_queries(0):
+        second = client.get(url, params)
+
+    assert second.status_code == 200
+    assert second.content == first.content
+
+
+@pytest.mark.django_db
+def test_project_detail_is_served_from_cache(
+    client, django_assert_num_queries, web_dev_project
+):
+    """Test the detail page is cached per pk."""
+    url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    client.get(url)
+
+    with django_assert_num_queries(0):
+        response = client.get(url)
+
+    assert web_dev_project.title.encode() in response.content
+
+
+@pytest.mark.django_db
+def test_project_list_cache_key_includes_category(
+    client, web_dev_project, sys_design_project
+):
+    """Test each category variant gets its own cache entry."""
+    url = reverse("projects")
+    client.get(url, {"category": "WEB_DEV"})
+
+    response = client.get(url, {"category": "SYS_DESIGN"})
+
+    assert [p.id for p in response.context["projects"]] == [sys_design_project.id]
+
+
+@pytest.mark.django_db
+def test_project_list_unknown_category_is_not_cached(client, web_dev_project):
+    """Test unknown categories always hit the view."""
+    url = reverse("projects")
+    client.get(url, {"category": "UNKNOWN"})
+
+    response = client.get(url, {"category": "UNKNOWN"})
+
+    assert response.context["current_filter"] == "UNKNOWN"
+
+
+@pytest.mark.django_db
+def test_project_list_grid_fragment_is_cached_on_its_own(
+    client, django_assert_num_queries, web_dev_project
+):
+    """Test the fragment has its own cache entry and ETag beside the page."""
+    url = reverse("projects")
+    page = client.get(url, {"category": "WEB_DEV"})
+    fragment = client.get(url, {"category": "WEB_DEV", "fragment": "grid"})
+
+    with django_assert_num_queries(0):
+        again = client.get(url, {"category": "WEB_DEV", "fragment": "grid"})
+
+    assert again.content == fragment.content != page.content
+    assert fragment["ETag"] != page["ETag"]
+
+
+@pytest.mark.django_db
+def test_project_save_invalidates_cached_grid_fragments(
+    client, web_dev_project, django_capture_on_commit_callbacks
+):
+    """Test a write drops the cached fragments along with the pages."""
+    url = reverse("projects")
+    client.get(url, {"category": "WEB_DEV", "fragment": "grid"})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.title = "Renamed Project"
+        web_dev_project.save()
+
+    response = client.get(url, {"category": "WEB_DEV", "fragment": "grid"})
+    assert b"Renamed Project" in response.content
+
+
+@pytest.mark.django_db
+def test_project_save_invalidates_cached_pages(
+    client, web_dev_project, django_capture_on_commit_callbacks
+):
+    """Test saving a project drops the cached listing and detail pages."""
+    list_url = reverse("projects")
+    detail_url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    client.get(list_url)
+    client.get(detail_url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.title = "Renamed Project"
+        web_dev_project.save()
+
+    assert b"Renamed Project" in client.get(list_url).content
+    assert b"Renamed Project" in client.get(detail_url).content
+
+
+@pytest.mark.django_db
+def test_project_category_change_invalidates_both_listings(
+    client, web_dev_project, django_capture_on_commit_callbacks
+):
+    """Test moving a project refreshes the old and the new category page."""
+    url = reverse("projects")
+    client.get(url, {"category": "WEB_DEV"})
+    client.get(url, {"category": "TALK"})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.category = "TALK"
+        web_dev_project.save()
+
+    assert len(client.get(url, {"category": "WEB_DEV"}).context["projects"]) == 0
+    assert len(client.get(url, {"category": "TALK"}).context["projects"]) == 1
+
+
+@pytest.mark.django_db
+def test_project_delete_invalidates_detail_page(
+    client, web_dev_project, django_capture_on_commit_callbacks
+):
+    """Test deleting a project stops serving its cached detail page."""
+    url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.delete()
+
+    assert client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_page_cache_hit_ratio_is_tracked_per_view(client):
+    """Test hits and misses are counted for each view."""
+    before_hits = _page_cache_lookups("home", "hit")
+    before_misses = _page_cache_lookups("home", "miss")
+
+    client.get(reverse("home"))
+    client.get(reverse("home"))
+    client.get(reverse("home"))
+
+    assert _page_cache_lookups("home", "hit") - before_hits == 2
+    assert _page_cache_lookups("home", "miss") - before_misses == 1
+    assert page_cache_hit_ratio("home") is not None
+
+
+@pytest.mark.django_db
+def test_page_cached_by_another_worker_comes_from_the_shared_tier(
+    client, django_assert_num_queries, web_dev_project
+):
+    """Test a worker with a cold local tier serves the shared copy."""
+    url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    client.get(url)
+    cache.local.clear()
+    shared_hits = _tier_lookups("shared", "hit")
+
+    with django_assert_num_queries(0):
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert _tier_lookups("shared", "hit") == shared_hits + 1
+
+
+def _page_cache_lookups(view_name, result):
+    return (
+        REGISTRY.get_sample_value(
+            "project_page_cache_requests_total",
+            {"view": view_name, "result": result},
+        )
+        or 0.0
+    )
+
+
+# ============================================================================
+# TIERED CACHE TESTS
+# ============================================================================
+
+
+def _tier_lookups(tier, result):
+    return (
+        REGISTRY.get_sample_value(
+            "project_cache_requests_total", {"tier": tier, "result": result}
+        )
+        or 0.0
+    )
+
+
+def test_tiered_cache_fills_the_local_tier_from_the_shared_one():
+    """Test a shared hit is kept locally and counted per tier."""
+    cache.set("greeting", "hello")
+    cache.local.clear()
+    shared_hits = _tier_lookups("shared", "hit")
+    local_hits = _tier_lookups("local", "hit")
+
+    assert cache.get("greeting") == "hello"
+    assert cache.get("greeting") == "hello"
+
+    assert _tier_lookups("shared", "hit") == shared_hits + 1
+    assert _tier_lookups("local", "hit") == local_hits + 1
+    assert cache_tier_hit_ratio("local") is not None
+
+
+def test_tiered_cache_delete_reaches_both_tiers():
+    """Test a delete leaves nothing behind in either tier."""
+    cache.set("greeting", "hello")
+
+    cache.delete("greeting")
+
+    assert cache.local.get("greeting") is None
+    assert cache.shared.get("greeting") is None
+
+
+def test_concurrent_misses_compute_once():
+    """Test callers missing together share one computation, not one object."""
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"calls": calls}
+
+    async def misses():
+        return await asyncio.gather(
+            *(cache.aget_or_compute("counted", compute) for _ in range(5))
+        )
+
+    results = async_to_sync(misses)()
+
+    assert calls == 1
+    assert results == [{"calls": 1}] * 5
+    assert len({id(result) for result in results}) == 5
+    assert cache.get("counted") == {"calls": 1}
+
+
+@pytest.mark.django_db
+def test_stale_entry_is_served_while_it_is_recomputed():
+    """Test stale-while-revalidate answers at once and refreshes behind."""
+    cache.shared.set("page", (time.time() - 1, pickle.dumps("old")), 60)
+
+    async def compute():
+        return "new"
+
+    async def stale_hit():
+        value = await cache.aget_or_compute("page", compute)
+        await asyncio.gather(*tiered_cache._flights.values())
+        return value
+
+    assert async_to_sync(stale_hit)() == "old"
+    assert cache.get("page") == "new"
+
+
+def test_miss_waits_for_the_process_holding_the_lock():
+    """Test only one process computes a key while others wait for it."""
+    cache.shared.add("page:computing", True, 10)
+
+    async def compute():
+        raise AssertionError("computed by a second process")
+
+    async def other_process():
+        await asyncio.sleep(0.1)
+        await cache.shared.aset("page", (time.time() + 60, pickle.dumps("theirs")), 60)
+        await cache.shared.adelete("page:computing")
+
+    async def miss():
+        value, _ = await asyncio.gather(
+            cache.aget_or_compute("page", compute), other_process()
+        )
+        return value
+
+    assert async_to_sync(miss)() == "theirs"
+
+
+# ============================================================================
+# VIEW METRICS TESTS
+# ============================================================================
+
+VIEW_HISTOGRAMS = (
+    "project_view_queries",
+    "project_view_db_seconds",
+    "project_view_render_seconds",
+    "project_view_response_bytes",
+)
+
+
+def _view_histogram(name, view, suffix):
+    return REGISTRY.get_sample_value(f"{name}_{suffix}", {"view": view}) or 0.0
+
+
+@pytest.mark.django_db
+def test_view_metrics_record_request_cost(client, web_dev_project):
+    """Test a request records its queries, DB time, render time and size."""
+    before = {
+        (name, suffix): _view_histogram(name, "projects", suffix)
+        for name in VIEW_HISTOGRAMS
+        for suffix in ("count", "sum")
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("projects"), {"tag": "PYTHON"})
+
+    def delta(name, suffix="sum"):
+        return _view_histogram(name, "projects", suffix) - before[name, suffix]
+
+    assert all(delta(name, "count") == 1 for name in VIEW_HISTOGRAMS)
+    assert delta("project_view_queries") == len(queries)
+    assert delta("project_view_db_seconds") > 0
+    assert delta("project_view_render_seconds") > 0
+    assert delta("project_view_response_bytes") == len(response.content)
+
+
+@pytest.mark.django_db
+def test_view_metrics_skip_unresolved_paths(client):
+    """Test unknown paths do not add label values to the view histograms."""
+    client.get("/no-such-page/")
+
+    views = {
+        sample.labels["view"]
+        for metric in REGISTRY.collect()
+        if metric.name == "project_view_queries"
+        for sample in metric.samples
+    }
+    assert not any("no-such-page" in view for view in views)
+
+
+@pytest.mark.django_db
+def test_pool_collector_exports_pool_statistics():
+    """Test pool size, checkouts, wait time and failures reach Prometheus."""
+    pool = ConnectionPool(
+        kwargs=connection.get_connection_params(), min_size=1, max_size=1, open=False
+    )
+    with pool, pool.connection():
+        with pytest.raises(PoolTimeout):
+            pool.getconn(timeout=0.01)
+
+        collector = DatabasePoolCollector(lambda: {"default": pool})
+        samples = {
+            (sample.name, *sample.labels.values()): sample.value
+            for metric in collector.collect()
+            for sample in metric.samples
+        }
+
+    assert samples["project_db_pool_connections", "default", "in_use"] == 1
+    assert samples["project_db_pool_connections", "default", "idle"] == 0
+    assert samples["project_db_pool_max_size", "default"] == 1
+    assert samples["project_db_pool_checkouts_total", "default"] == 2
+    assert samples["project_db_pool_wait_seconds_total", "default"] > 0
+    assert samples["project_db_pool_checkout_failures_total", "default"] == 1
+
+
+# ============================================================================
+# CONDITIONAL GET TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name,params",
+    [
+        ("home", {}),
+        ("projects", {}),
+        ("projects", {"category": "TALK"}),
+        ("projects", {"category": "UNKNOWN"}),
+    ],
+)
+def test_public_views_send_etag(client, web_dev_project, url_name, params):
+    """Test the listing pages carry an ETag."""
+    response = client.get(reverse(url_name), params)
+    assert response.status_code == 200
+    assert response.has_header("ETag")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(("url_name", "queries"), [("home", 0), ("projects", 1)])
+def test_matching_etag_returns_304_without_rendering(
+    client, django_assert_num_queries, web_dev_project, url_name, queries
+):
+    """Test revalidation costs at most one query and renders no template."""
+    url = reverse(url_name)
+    etag = client.get(url)["ETag"]
+    cache.clear()
+
+    with django_assert_num_queries(queries):
+        response = client.get(url, headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.templates == []
+
+
+@pytest.mark.django_db
+def test_cached_page_answers_revalidation_without_queries(
+    client, django_assert_num_queries, web_dev_project
+):
+    """Test a cached page is revalidated from its stored ETag."""
+    url = reverse("projects")
+    etag = client.get(url)["ETag"]
+
+    with django_assert_num_queries(0):
+        response = client.get(url, headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_project_detail_sends_last_modified(client, web_dev_project):
+    """Test the detail page carries both validators."""
+    url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    response = client.get(url)
+    assert response.has_header("ETag")
+    assert response.has_header("Last-Modified")
+
+
+@pytest.mark.django_db
+def test_project_detail_if_modified_since_returns_304(client, web_dev_project):
+    """Test If-Modified-Since revalidates the detail page."""
+    url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    last_modified = client.get(url)["Last-Modified"]
+    cache.clear()
+
+    response = client.get(url, headers={"if-modified-since": last_modified})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_project_update_changes_etag(client, web_dev_project):
+    """Test editing a project yields a new ETag and a full response."""
+    url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    etag = client.get(url)["ETag"]
+    cache.clear()
+
+    web_dev_project.title = "Updated Title"
+    web_dev_project.save()
+    response = client.get(url, headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_project_delete_changes_listing_etag(
+    client, web_dev_project, sys_design_project, django_capture_on_commit_callbacks
+):
+    """Test removing an older row still invalidates the listing ETag."""
+    url = reverse("projects")
+    etag = client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.delete()
+    response = client.get(url, headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_tag_listing_etag_comes_from_the_page(
+    client, django_assert_num_queries, web_dev_project
+):
+    """Test a tag page revalidates with its page query and changes on edit."""
+    url, params = reverse("projects"), {"tag": "PYTHON"}
+    etag = client.get(url, params)["ETag"]
+    cache.clear()
+
+    with django_assert_num_queries(1):
+        response = client.get(url, params, headers={"if-none-match": etag})
+    assert response.status_code == 304
+
+    web_dev_project.title = "Renamed"
+    web_dev_project.save()
+    cache.clear()
+    response = client.get(url, params, headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+# ============================================================================
+# IMAGE VARIANT TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+def test_upload_builds_image_variants(create_project, png_image):
+    """Test saving a project writes resized variants next to the upload."""
+    project = create_project(image=png_image)
+    project.refresh_from_db()
+
+    variants = project.image_variants
+    assert variants["source"] == project.image.name
+    for fmt in available_formats():
+        assert [width for width, _name in variants[fmt]] == list(VARIANT_WIDTHS)
+        for width, name in variants[fmt]:
+            assert name == variant_name(project.image.name, width, fmt)
+            assert default_storage.exists(name)
+
+
+@pytest.mark.django_db
+def test_variants_are_not_rebuilt_on_unrelated_save(create_project, png_image):
+    """Test variants are built once per upload."""
+    project = create_project(image=png_image)
+    _width, name = project.image_variants["webp"][0]
+    default_storage.delete(name)
+
+    project.title = "Renamed"
+    project.save()
+
+    assert not default_storage.exists(name)
+
+
+@pytest.mark.django_db
+def test_small_upload_is_not_upscaled(create_project):
+    """Test uploads narrower than every variant width keep their size."""
+    buffer = BytesIO()
+    Image.new("RGB", (200, 100)).save(buffer, "PNG")
+    upload = SimpleUploadedFile("small.png", buffer.getvalue(), "image/png")
+
+    project = create_project(image=upload)
+
+    assert [width for width, _name in project.image_variants["webp"]] == [200]
+
+
+@pytest.mark.django_db
+def test_unreadable_upload_is_recorded_without_variants(web_dev_project):
+    """Test a broken upload does not fail the save."""
+    assert web_dev_project.image_variants == {"source": web_dev_project.image.name}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["home", "projects", "project_detail"])
+def test_pages_emit_srcset(client, create_project, png_image, url_name):
+    """Test public pages offer the variants through srcset and sizes."""
+    project = create_project(featured=True, image=png_image)
+    kwargs = {"pk": project.pk} if url_name == "project_detail" else {}
+
+    content = client.get(reverse(url_name, kwargs=kwargs)).content.decode()
+
+    _width, name = project.image_variants["webp"][-1]
+    assert 'type="image/webp"' in content
+    assert f"{default_storage.url(name)} 1280w" in content
+    assert "sizes=" in content
+    assert project.image.url in content
+
+
+@pytest.mark.django_db
+def test_generate_image_variants_backfills_existing_rows(create_project, png_image):
+    """Test the backfill command builds variants for rows without them."""
+    project = create_project(image=png_image)
+    Project.objects.filter(pk=project.pk).update(image_variants={})
+
+    call_command("generate_image_variants", stdout=StringIO())
+
+    project.refresh_from_db()
+    assert project.image_variants["source"] == project.image.name
+    assert project.image_variants["webp"]
+
+
+@pytest.mark.django_db
+def test_generate_image_variants_refreshes_cached_pages(
+    tmp_path, settings, client, create_project, png_image
+):
+    """Test a backfill changes the ETag and reaches every cached copy."""
+    settings.PRERENDER_ROOT = str(tmp_path)
+    project = create_project(image=png_image)
+    Project.objects.filter(pk=project.pk).update(image_variants={})
+    rebuild_listing_snapshots()
+    url = reverse("projects")
+    before = client.get(url)
+    assert b"srcset" not in before.content
+    async_to_sync(prerender_site)(tmp_path)
+
+    call_command("generate_image_variants", stdout=StringIO())
+
+    after = client.get(url, headers={"if-none-match": before["ETag"]})
+    assert after.status_code == 200
+    assert b"srcset" in after.content
+    assert b"srcset" in (tmp_path / "projects/index.html").read_bytes()
+    assert b"srcset" in (tmp_path / f"projects/{project.pk}/index.html").read_bytes()
+
+
+# ============================================================================
+# MEDIA SERVER TESTS
+# ============================================================================
+
+
+@pytest.fixture
+def media_file(media_root):
+    """Write a 200 KiB file under MEDIA_ROOT."""
+    path = media_root / "projects" / "large.bin"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(range(256)) * 800)
+    return path
+
+
+def _streamed(response):
+    async def collect():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(collect)()
+
+
+def test_media_streams_whole_file(client, media_file):
+    """Test media files are streamed with validators and cache headers."""
+    response = client.get("/media/projects/large.bin")
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert _streamed(response) == media_file.read_bytes()
+    assert response["Content-Length"] == str(media_file.stat().st_size)
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["ETag"].startswith('"')
+    assert "max-age=" in response["Cache-Control"]
+
+
+@pytest.mark.parametrize(
+    "header,start,end",
+    [
+        ("bytes=0-99", 0, 99),
+        ("bytes=1000-", 1000, 204799),
+        ("bytes=-500", 204300, 204799),
+        ("bytes=204000-999999", 204000, 204799),
+    ],
+)
+def test_media_serves_byte_ranges(client, media_file, header, start, end):
+    """Test a single Range is answered with 206 and the matching slice."""
+    response = client.get("/media/projects/large.bin", headers={"range": header})
+
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes {start}-{end}/204800"
+    assert _streamed(response) == media_file.read_bytes()[start : end + 1]
+
+
+def test_media_rejects_unsatisfiable_range(client, media_file):
+    """Test a range past the end of the file returns 416."""
+    response = client.get(
+        "/media/projects/large.bin", headers={"range": "bytes=999999-"}
+    )
+    assert response.status_code == 416
+    assert response["Content-Range"] == "bytes */204800"
+
+
+def test_media_ignores_range_when_if_range_is_stale(client, media_file):
+    """Test If-Range with an old ETag falls back to the full file."""
+    response = client.get(
+        "/media/projects/large.bin",
+        headers={"range": "bytes=0-99", "if-range": '"stale"'},
+    )
+    assert response.status_code == 200
+
+
+def test_media_if_none_match_returns_304(client, media_file):
+    """Test revalidating an unchanged file returns 304."""
+    etag = client.get("/media/projects/large.bin")["ETag"]
+
+    response = client.get("/media/projects/large.bin", headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("path", ["missing.jpg", "projects", "../conftest.py"])
+def test_media_returns_404_for_missing_or_unsafe_paths(client, media_file, path):
+    """Test directories, missing files and traversal attempts are not served."""
+    assert client.get(f"/media/{path}").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "mode,header,value",
+    [
+        ("x-accel-redirect", "X-Accel-Redirect", "/protected-media/projects/large.bin"),
+        ("x-sendfile", "X-Sendfile", None),
+    ],
+)
+def test_media_offload_delegates_to_proxy(
+    client, settings, media_file, mode, header, value
+):
+    """Test offload mode returns headers only and lets the proxy send the file."""
+    settings.MEDIA_OFFLOAD = mode
+
+    response = client.get("/media/projects/large.bin")
+
+    assert response.status_code == 200
+    assert response[header] == (value or str(media_file))
+    assert response.content == b""
+
+
+# ============================================================================
+# COMPRESSION TESTS
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=1, br;q=0.5", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_accepted_encoding_prefers_brotli_then_gzip(accept_encoding, expected):
+    """Test q-values decide, and Brotli wins over gzip on a tie."""
+    assert compression.accepted_encoding(accept_encoding) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("accept_encoding", "decompress"),
+    [("br, gzip", brotli.decompress), ("gzip", gzip.decompress)],
+)
+def test_html_is_compressed_for_clients_that_accept_it(
+    client, web_dev_project, accept_encoding, decompress
+):
+    """Test pages come compressed, with a weak ETag and Vary set."""
+    plain = client.get("/projects/")
+
+    response = client.get("/projects/", headers={"accept-encoding": accept_encoding})
+
+    assert response["Content-Encoding"] == accept_encoding.split(",")[0]
+    assert decompress(response.content) == plain.content
+    assert response["ETag"] == f"W/{plain['ETag']}"
+    assert "Accept-Encoding" in response["Vary"]
+    assert "Content-Encoding" not in plain
+
+
+@pytest.mark.django_db
+def test_small_responses_are_not_compressed(settings, client, web_dev_project):
+    """Test responses under COMPRESS_MIN_SIZE are sent as they are."""
+    settings.COMPRESS_MIN_SIZE = 10**9
+
+    response = client.get("/projects/", headers={"accept-encoding": "br"})
+
+    assert "Content-Encoding" not in response
+
+
+@pytest.mark.django_db
+def test_page_versions_are_compressed_once(monkeypatch, client, web_dev_project):
+    """Test repeat requests for an unchanged page reuse the compressed body."""
+    calls = []
+    original = compression.compress
+    monkeypatch.setattr(
+        compression,
+        "compress",
+        lambda data, encoding: calls.append(encoding) or original(data, encoding),
+    )
+
+    first = client.get("/projects/", headers={"accept-encoding": "br"})
+    second = client.get("/projects/", headers={"accept-encoding": "br"})
+
+    assert first.content == second.content
+    assert calls == ["br"]
+
+
+@pytest.mark.django_db
+def test_admin_pages_are_not_compressed(client):
+    """Test the admin login, which holds a CSRF token next to ?next=, stays plain."""
+    response = client.get(
+        reverse("admin:login"), {"next": "/admin/x"}, headers={"accept-encoding": "br"}
+    )
+
+    assert b"csrfmiddlewaretoken" in response.content
+    assert "Content-Encoding" not in response
+
+
+@pytest.mark.parametrize(
+    "mark_response",
+    [
+        lambda request, response: get_token(request),
+        lambda request, response: response.set_cookie("flavour", "plain"),
+        lambda request, response: response.headers.__setitem__("Vary", "Cookie"),
+    ],
+    ids=["csrf-token", "set-cookie", "vary-cookie"],
+)
+def test_responses_that_may_hold_secrets_are_not_compressed(mark_response):
+    """Test CSRF tokens, cookies and per-session pages are sent uncompressed."""
+
+    async def view(request):
+        response = HttpResponse("secret " * 200)
+        mark_response(request, response)
+        return response
+
+    async def fetch():
+        request = HttpRequest()
+        request.META["HTTP_ACCEPT_ENCODING"] = "br"
+        handler = CsrfViewMiddleware(view)
+        return await compression.CompressionMiddleware(handler)(request)
+
+    response = async_to_sync(fetch)()
+
+    assert "Content-Encoding" not in response
+
+
+def test_streaming_responses_are_compressed_chunk_by_chunk():
+    """Test each chunk of an async stream is flushed as it is compressed."""
+
+    async def body():
+        yield b"first " * 100
+        yield b"second " * 100
+
+    async def view(request):
+        return StreamingHttpResponse(body(), content_type="text/plain")
+
+    async def fetch():
+        request = HttpRequest()
+        request.META["HTTP_ACCEPT_ENCODING"] = "gzip"
+        response = await compression.CompressionMiddleware(view)(request)
+        return response, [chunk async for chunk in response.streaming_content]
+
+    response, chunks = async_to_sync(fetch)()
+
+    assert response["Content-Encoding"] == "gzip"
+    assert len(chunks) == 3
+    assert gzip.decompress(b"".join(chunks)) == b"first " * 100 + b"second " * 100
+
+
+# ============================================================================
+# WARM-UP TESTS
+# ============================================================================
+
+
+@pytest.fixture
+def cold_worker(monkeypatch):
+    """A worker that has not warmed up yet."""
+    monkeypatch.setattr(warmup, "state", warmup.WarmupState())
+
+
+@pytest.mark.django_db
+def test_lifespan_startup_warms_the_worker(cold_worker):
+    """Test startup compiles the templates and routes before completing."""
+    loader = engines.all()[0].engine.template_loaders[0]
+    loader.reset()
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async_to_sync(warmup.WarmupMiddleware(None))({"type": "lifespan"}, receive, send)
+
+    assert sent == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+    assert warmup.state.ready
+    assert warmup.state.routes > 0
+    assert "pages/home.html" in loader.get_template_cache
+    assert ListingSnapshot.objects.filter(category="all").exists()
+
+
+@pytest.mark.django_db
+def test_ready_is_unavailable_until_warm_up_succeeds(client, cold_worker, monkeypatch):
+    """Test the readiness probe reports 503 and retries a failed warm-up."""
+    database_up = False
+
+    def check_databases():
+        if not database_up:
+            raise OperationalError("connection refused")
+
+    monkeypatch.setattr(warmup, "check_databases", check_databases)
+
+    response = client.get(reverse("ready"))
+    assert response.status_code == 503
+    assert "no-cache" in response["Cache-Control"]
+
+    database_up = True
+    assert client.get(reverse("ready")).status_code == 200
+
+
+# ============================================================================
+# ASYNC VIEW TESTS
+# ============================================================================
+
+
+@pytest.mark.parametrize("view", [views.home, views.project_list, views.project_detail])
+def test_public_views_are_async(view):
+    """Test the public views run natively on the ASGI event loop."""
+    assert inspect.iscoroutinefunction(view)
+    assert inspect.iscoroutinefunction(inspect.unwrap(view))
+
+
+def test_asgi_middleware_chain_is_async():
+    """Test no sync-only middleware forces the ASGI chain into a thread."""
+    chain = ASGIHandler()._middleware_chain
+    assert inspect.iscoroutinefunction(chain)
+    assert not isinstance(chain, SyncToAsync)
+
+
+def test_static_files_are_served_under_asgi(async_client):
+    """Test the async WhiteNoise middleware still serves collected files."""
+    response = async_to_sync(async_client.get)("/static/admin/css/base.css")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/css")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["home", "projects", "project_detail"])
+def test_public_views_render_under_async_client(async_client, create_project, url_name):
+    """Test the views do not query from the template under ASGI."""
+    project = create_project(featured=True)
+    kwargs = {"pk": project.pk} if url_name == "project_detail" else {}
+
+    response = async_to_sync(async_client.get)(reverse(url_name, kwargs=kwargs))
+
+    assert response.status_code == 200
+    assert project.title.encode() in response.content
+
+
+# ============================================================================
+# KEYSET PAGINATION TESTS
+# ============================================================================
+
+
+@pytest.fixture
+def paged_projects(settings, create_project):
+    """Create five web projects and two talks with a page size of two."""
+    settings.PROJECTS_PAGE_SIZE = 2
+    web = [
+        create_project(title=f"Web {year}-{n}", category="WEB_DEV", year=year)
+        for year, n in [(2021, 1), (2024, 1), (2022, 1), (2024, 2), (2023, 1)]
+    ]
+    talks = [
+        create_project(title=f"Talk {year}", category="TALK", year=year)
+        for year in (2020, 2025)
+    ]
+    return web, talks
+
+
+def _expected_order(projects):
+    return [p.id for p in sorted(projects, key=lambda p: (p.year, p.pk), reverse=True)]
+
+
+def _walk_pages(client, params):
+    pages = []
+    response = client.get(reverse("projects"), params)
+    while True:
+        pages.append(response)
+        cursor = response.context["next_cursor"]
+        if cursor is None:
+            return pages
+        response = client.get(reverse("projects"), {**params, "cursor": cursor})
+
+
+@pytest.mark.django_db
+def test_project_list_first_page_is_limited(client, paged_projects):
+    """Test the listing renders one page, newest first."""
+    web, talks = paged_projects
+    response = client.get(reverse("projects"))
+
+    assert [p.id for p in response.context["projects"]] == _expected_order(web + talks)[
+        :2
+    ]
+    assert response.context["previous_cursor"] is None
+    assert response.context["next_cursor"]
+
+
+@pytest.mark.django_db
+def test_project_list_projects_json_is_limited_to_page(client, paged_projects):
+    """Test the embedded JSON only carries the current page."""
+    response = client.get(reverse("projects"))
+    projects_json = json.loads(response.context["projects_json"])
+    assert [p["id"] for p in projects_json] == [
+        p.id for p in response.context["projects"]
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("category", ["all", "WEB_DEV", "TALK"])
+def test_project_list_next_cursors_walk_every_row_once(
+    client, paged_projects, category
+):
+    """Test following next cursors visits each project exactly once in order."""
+    web, talks = paged_projects
+    expected = {"all": web + talks, "WEB_DEV": web, "TALK": talks}[category]
+
+    pages = _walk_pages(client, {"category": category})
+
+    seen = [p.id for page in pages for p in page.context["projects"]]
+    assert seen == _expected_order(expected)
+    assert all(page.context["current_filter"] == category for page in pages)
+
+
+@pytest.mark.django_db
+def test_project_list_previous_cursor_returns_previous_page(client, paged_projects):
+    """Test the previous cursor leads back to the page before."""
+    pages = _walk_pages(client, {"category": "WEB_DEV"})
+    last = pages[-1]
+
+    response = client.get(
+        reverse("projects"),
+        {"category": "WEB_DEV", "cursor": last.context["previous_cursor"]},
+    )
+
+    assert response.context["projects"] == pages[-2].context["projects"]
+    assert response.context["next_cursor"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("cursor", ["garbage", "W10", "WzEsMiwieCJd"])
+def test_project_list_invalid_cursor_returns_404(client, cursor):
+    """Test malformed cursors are rejected."""
+    response = client.get(reverse("projects"), {"cursor": cursor})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_project_list_renders_pagination_links(client, paged_projects):
+    """Test the page links carry the category and the cursor."""
+    response = client.get(reverse("projects"), {"category": "WEB_DEV"})
+    cursor = response.context["next_cursor"]
+    assert f"?category=WEB_DEV&amp;cursor={cursor}".encode() in response.content
+
+
+# ============================================================================
+# SEARCH TESTS
+# ============================================================================
+
+
+@pytest.fixture
+def searchable_projects(create_project):
+    """Create projects that mention kafka in different weighted fields."""
+    return {
+        "title": create_project(title="Kafka Pipeline", description="Streams."),
+        "stack": create_project(title="Payments", stack="GOLANG KAFKA"),
+        "description": create_project(
+            title="Ledger", description="Events flow through Kafka topics."
+        ),
+        "unrelated": create_project(title="Static Site", stack="HUGO"),
+    }
+
+
+@pytest.mark.django_db
+def test_search_view_uses_correct_template(client):
+    """Test the search page renders without a query."""
+    response = client.get(reverse("search"))
+    assert response.status_code == 200
+    assert "pages/search.html" in [t.name for t in response.templates]
+    assert response.context["results"] == []
+
+
+@pytest.mark.django_db
+def test_search_ranks_by_field_weight(client, searchable_projects):
+    """Test title matches outrank stack matches, which outrank description."""
+    response = client.get(reverse("search"), {"q": "kafka"})
+    assert response.context["results"] == [
+        searchable_projects["title"],
+        searchable_projects["stack"],
+        searchable_projects["description"],
+    ]
+
+
+@pytest.mark.django_db
+def test_search_highlights_and_escapes_snippets(client, create_project):
+    """Test matches are wrapped in <mark> and project text stays escaped."""
+    create_project(description="Latency < 5ms with Redis & Lua")
+
+    response = client.get(reverse("search"), {"q": "redis"})
+
+    snippet = response.context["results"][0].snippet
+    assert snippet.endswith("Latency &lt; 5ms with <mark>Redis</mark> &amp; Lua")
+
+
+@pytest.mark.django_db
+def test_search_without_matches_shows_empty_state(client, searchable_projects):
+    """Test an unmatched query renders the empty state."""
+    response = client.get(reverse("search"), {"q": "cobol"})
+    assert response.context["results"] == []
+    assert b"NO PROJECTS MATCH" in response.content
+
+
+@pytest.mark.django_db
+def test_search_vector_tracks_updates(client, searchable_projects):
+    """Test the generated vector follows edits to the source fields."""
+    project = searchable_projects["unrelated"]
+    project.challenge = "Rebuilt the Kafka consumer"
+    project.save()
+
+    response = client.get(reverse("search"), {"q": "kafka"})
+
+    assert project in response.context["results"]
+
+
+@pytest.mark.django_db
+def test_admin_search_uses_search_vector(admin_client, searchable_projects):
+    """Test the admin changelist search goes through the full-text index."""
+    response = admin_client.get(
+        reverse("admin:project_project_changelist"), {"q": "topics"}
+    )
+    assert list(response.context["cl"].queryset) == [searchable_projects["description"]]
+
+
+# ============================================================================
+# TAG TESTS
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "stack,expected",
+    [
+        ("Python Django PostgreSQL", ["PYTHON", "DJANGO", "POSTGRESQL"]),
+        ("PYTHON, AWS, TERRAFORM", ["PYTHON", "AWS", "TERRAFORM"]),
+        ("go  GO redis", ["GO", "REDIS"]),
+        ("", []),
+    ],
+)
+def test_parse_stack(stack, expected):
+    """Test stack strings split on whitespace and commas without duplicates."""
+    assert parse_stack(stack) == expected
+
+
+@pytest.mark.django_db
+def test_saving_project_syncs_tags_in_stack_order(web_dev_project):
+    """Test tags follow the stack field, keeping its order."""
+    assert [t.name for t in web_dev_project.stack_tags] == [
+        "PYTHON",
+        "DJANGO",
+        "POSTGRESQL",
+    ]
+
+    web_dev_project.stack = "Rust Python"
+    web_dev_project.save()
+
+    project = Project.objects.with_tags().get(pk=web_dev_project.pk)
+    assert [t.name for t in project.stack_tags] == ["RUST", "PYTHON"]
+    assert Tag.objects.filter(name="DJANGO").exists()
+
+
+@pytest.mark.django_db
+def test_stack_without_separators_fits_one_tag(create_project):
+    """Test a stack written as one long token saves instead of overflowing."""
+    stack = "PYTHON/DJANGO/POSTGRESQL/REDIS/DOCKER/KUBERNETES/AWS/" + "A" * 40
+    project = create_project(stack=stack)
+    assert [t.name for t in project.stack_tags] == [stack]
+
+
+@pytest.mark.django_db
+def test_saving_unchanged_stack_keeps_tag_rows(
+    web_dev_project, django_assert_num_queries
+):
+    """Test a save that leaves the stack alone does not rewrite its tags."""
+    before = list(web_dev_project.project_tags.values_list("pk", flat=True))
+
+    with django_assert_num_queries(1):
+        web_dev_project.sync_tags()
+
+    assert list(web_dev_project.project_tags.values_list("pk", flat=True)) == before
+
+
+@pytest.mark.django_db
+def test_project_list_filters_by_tag(client, create_project):
+    """Test ?tag= narrows the listing to projects using that technology."""
+    go = create_project(title="Go Service", stack="GOLANG REDIS")
+    create_project(title="Py Service", stack="PYTHON")
+
+    response = client.get(reverse("projects"), {"tag": "golang"})
+
+    assert [p.id for p in response.context["projects"]] == [go.id]
+    assert response.context["current_tag"] == "GOLANG"
+
+
+@pytest.mark.django_db
+def test_project_list_tag_combines_with_category(client, create_project):
+    """Test the tag filter applies within the selected category."""
+    create_project(title="Go Web", category="WEB_DEV", stack="GOLANG")
+    go_talk = create_project(title="Go Talk", category="TALK", stack="GOLANG")
+
+    response = client.get(reverse("projects"), {"tag": "GOLANG", "category": "TALK"})
+
+    assert [p.id for p in response.context["projects"]] == [go_talk.id]
+
+
+@pytest.mark.django_db
+def test_project_list_projects_json_tags_come_from_tag_table(client, web_dev_project):
+    """Test the embedded JSON lists the normalized tags."""
+    Tag.objects.filter(name="DJANGO").update(name="DJANGO 5")
+
+    response = client.get(reverse("projects"))
+    projects_json = json.loads(response.context["projects_json"])
+    assert projects_json[0]["tags"] == ["PYTHON", "DJANGO 5", "POSTGRESQL"]
+
+
+@pytest.mark.django_db
+def test_project_list_tag_query_count_is_constant(
+    client, create_project, django_assert_max_num_queries
+):
+    """Test the listing renders tags without a query per project."""
+    for n in range(8):
+        create_project(title=f"Project {n}", stack=f"PYTHON TAG{n} EXTRA{n}")
+
+    # ETag aggregate, page query and one prefetch for all tags.
+    with django_assert_max_num_queries(3):
+        response = client.get(reverse("projects"))
+
+    assert b"TAG7" in response.content
+
+
+@pytest.mark.django_db
+def test_project_list_tag_follows_year_change(client, create_project):
+    """Test a new year re-sorts the tag page even when the stack is unchanged."""
+    older = create_project(title="Older", year=2020, stack="GOLANG")
+    newer = create_project(title="Newer", year=2024, stack="GOLANG")
+
+    older.year = 2025
+    older.save()
+    response = client.get(reverse("projects"), {"tag": "GOLANG"})
+
+    assert set(older.project_tags.values_list("year", flat=True)) == {2025}
+    assert [p.id for p in response.context["projects"]] == [older.id, newer.id]
+
+
+@pytest.mark.django_db
+def test_project_list_tag_pages_through_every_match(client, create_project, settings):
+    """Test cursors on a tag page follow the tag's rows, not the whole catalogue."""
+    settings.PROJECTS_PAGE_SIZE = 2
+    tagged = [
+        create_project(title=f"Go {n}", year=2020 + n % 3, stack="GOLANG")
+        for n in range(5)
+    ]
+    create_project(title="Py", year=2024, stack="PYTHON")
+
+    seen, params = [], {"tag": "GOLANG"}
+    while True:
+        response = client.get(reverse("projects"), params)
+        seen += [p.id for p in response.context["projects"]]
+        if not response.context["next_cursor"]:
+            break
+        params = {"tag": "GOLANG", "cursor": response.context["next_cursor"]}
+
+    expected = sorted(tagged, key=lambda p: (p.year, p.id), reverse=True)
+    assert seen == [p.id for p in expected]
+
+
+@pytest.mark.django_db
+def test_project_detail_links_tags_to_listing(client, web_dev_project):
+    """Test the detail page links each tag to the filtered listing."""
+    url = reverse("project_detail", kwargs={"pk": web_dev_project.pk})
+    response = client.get(url)
+    assert f"{reverse('projects')}?tag=DJANGO".encode() in response.content
+
+
+# ============================================================================
+# LISTING PROJECTION TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["home", "projects"])
+def test_listing_pages_skip_long_text_columns(client, web_dev_project, url_name):
+    """Test list pages never select the fields only the detail page shows."""
+    with CaptureQueriesContext(connection) as queries:
+        client.get(reverse(url_name))
+
+    page_query = next(q["sql"] for q in queries if '"title"' in q["sql"])
+    for column in ("description", "challenge", "key_features", "search_vector"):
+        assert f'"{column}"' not in page_query
+
+
+@pytest.mark.django_db
+def test_listing_cards_carry_display_fields(client, web_dev_project):
+    """Test cards expose what the listing template renders."""
+    response = client.get(reverse("projects"))
+    card = response.context["projects"][0]
+
+    assert isinstance(card, ProjectCard)
+    assert card.category_display == "Web Development"
+    assert card.tags == ["PYTHON", "DJANGO", "POSTGRESQL"]
+    assert card.image == web_dev_project.image.name
+    assert b"Web Development" in response.content
+
+
+def test_project_card_json_has_listing_keys():
+    """Test the embedded JSON keeps the keys the page script reads."""
+    card = ProjectCard(
+        id=3,
+        title="Title",
+        category="TALK",
+        year=2024,
+        short_summary="Summary",
+        tags=["GO"],
+        image="",
+        image_variants={},
+    )
+    assert card.as_json() == {
+        "id": 3,
+        "title": "Title",
+        "category": "TALK",
+        "year": 2024,
+        "short_summary": "Summary",
+        "tags": ["GO"],
+    }
+
+
+# ============================================================================
+# LISTING SNAPSHOT TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+def test_listing_first_page_is_one_snapshot_query(
+    client, web_dev_project, django_assert_num_queries
+):
+    """Test a built snapshot answers both the ETag and the page."""
+    rebuild_listing_snapshots()
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse("projects"), {"category": "WEB_DEV"})
+
+    assert [p.id for p in response.context["projects"]] == [web_dev_project.id]
+    assert response["ETag"].endswith('-projects-WEB_DEV-v1"')
+
+
+@pytest.mark.django_db
+def test_listing_snapshot_is_built_on_first_request(client, web_dev_project):
+    """Test a missing snapshot is materialized instead of failing."""
+    client.get(reverse("projects"))
+    snapshot = ListingSnapshot.objects.get(category="all")
+    assert [card["id"] for card in snapshot.cards] == [web_dev_project.id]
+
+
+@pytest.mark.django_db
+def test_project_write_bumps_snapshot_version(
+    client, web_dev_project, django_capture_on_commit_callbacks
+):
+    """Test saving a project rebuilds the snapshots with a new version."""
+    rebuild_listing_snapshots()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.title = "Renamed"
+        web_dev_project.save()
+
+    snapshot = ListingSnapshot.objects.get(category="WEB_DEV")
+    assert snapshot.version == 2
+    assert json.loads(bytes(snapshot.payload))[0]["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_listing_snapshot_follows_page_size(client, settings, paged_projects):
+    """Test a snapshot built for another page size is rebuilt."""
+    settings.PROJECTS_PAGE_SIZE = 5
+    rebuild_listing_snapshots()
+    settings.PROJECTS_PAGE_SIZE = 2
+
+    response = client.get(reverse("projects"))
+
+    assert len(response.context["projects"]) == 2
+    assert ListingSnapshot.objects.get(category="all").page_size == 2
+
+
+@pytest.mark.django_db
+def test_listing_snapshot_from_older_card_layout_is_rebuilt(client, web_dev_project):
+    """Test cards stored by a release with other fields are not loaded."""
+    rebuild_listing_snapshots()
+    snapshot = ListingSnapshot.objects.get(category="all")
+    snapshot.cards = [{**card, "retired_field": 1} for card in snapshot.cards]
+    snapshot.schema = "previous"
+    snapshot.save()
+
+    response = client.get(reverse("projects"))
+
+    assert response.status_code == 200
+    assert ListingSnapshot.objects.get(category="all").schema == CARD_SCHEMA
+
+
+@pytest.mark.django_db
+def test_listing_embeds_snapshot_payload(client, create_project):
+    """Test the stored JSON is placed in the page without re-encoding."""
+    create_project(title="</script><b>x</b> & co")
+
+    response = client.get(reverse("projects"))
+
+    assert b"\\u003c/script\\u003e\\u003cb\\u003ex" in response.content
+    assert json.loads(response.context["projects_json"])[0]["title"] == (
+        "</script><b>x</b> & co"
+    )
+
+
+def test_dumps_escapes_script_sensitive_characters():
+    """Test the encoder output is safe inside a script element."""
+    raw = dumps({"html": "<a href='x'>&</a>", "text": "Ünïcode"})
+    assert b"<" not in raw and b">" not in raw and b"&" not in raw
+    assert json.loads(raw) == {"html": "<a href='x'>&</a>", "text": "Ünïcode"}
+
+
+# ============================================================================
+# PRE-RENDERED TEXT TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+def test_save_renders_text_fields(create_project):
+    """Test saving a project stores the HTML for the long-form fields."""
+    project = create_project(
+        description="First <b>para</b>\n\nSecond",
+        challenge="Hard & slow",
+        key_features="One\nTwo",
+    )
+    project.refresh_from_db()
+
+    assert project.description_html == (
+        "<p>First &lt;b&gt;para&lt;/b&gt;</p>\n\n<p>Second</p>"
+    )
+    assert project.challenge_html == "<p>Hard &amp; slow</p>"
+    assert project.key_features_html == "<p>One<br>Two</p>"
+
+
+@pytest.mark.django_db
+def test_save_with_update_fields_writes_rendered_html(create_project):
+    """Test a partial save also writes the HTML of the fields it names."""
+    project = create_project(description="Before", challenge="Kept")
+    project.description = "After"
+    project.challenge = "Not saved"
+
+    project.save(update_fields=["description"])
+
+    project.refresh_from_db()
+    assert project.description_html == "<p>After</p>"
+    assert project.challenge_html == "<p>Kept</p>"
+
+
+@pytest.mark.django_db
+def test_project_detail_emits_stored_html(client, create_project):
+    """Test the detail page serves the stored HTML, not the raw fields."""
+    project = create_project()
+    Project.objects.filter(pk=project.pk).update(description_html="<p>STORED</p>")
+
+    response = client.get(reverse("project_detail", kwargs={"pk": project.pk}))
+
+    assert b"<p>STORED</p>" in response.content
+    assert "description" in response.context["project"].get_deferred_fields()
+
+
+@pytest.mark.django_db
+def test_render_project_text_command_backfills(create_project):
+    """Test the command fills HTML columns left empty by update()."""
+    project = create_project(description="Backfilled")
+    Project.objects.filter(pk=project.pk).update(description_html="")
+    out = StringIO()
+
+    call_command("render_project_text", stdout=out)
+
+    project.refresh_from_db()
+    assert project.description_html == "<p>Backfilled</p>"
+    assert "Rendered text for 1 projects" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_render_project_text_command_refreshes_prerendered_pages(
+    tmp_path, settings, create_project
+):
+    """Test re-rendered HTML reaches the pre-rendered detail page."""
+    settings.PRERENDER_ROOT = str(tmp_path)
+    project = create_project(description="Backfilled")
+    Project.objects.filter(pk=project.pk).update(description_html="")
+    async_to_sync(prerender_site)(tmp_path)
+    page = tmp_path / f"projects/{project.pk}/index.html"
+    assert b"<p>Backfilled</p>" not in page.read_bytes()
+
+    call_command("render_project_text", stdout=StringIO())
+
+    assert b"<p>Backfilled</p>" in page.read_bytes()
+
+
+def test_render_text_markdown_needs_package(settings, monkeypatch):
+    """Test choosing Markdown without the package fails loudly."""
+    settings.PROJECT_TEXT_FORMAT = "markdown"
+    monkeypatch.setattr(text, "markdown", None)
+    with pytest.raises(ImproperlyConfigured):
+        text.render_text("# Title")
+
+
+# ============================================================================
+# SEED DATA TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+def test_seed_data_generates_a_valid_catalogue():
+    """Test seed_data stores category keys, rendered text and synced tags."""
+    call_command("seed_data", count=40, batch_size=15, seed=1, stdout=StringIO())
+
+    assert Project.objects.count() == 43
+    assert set(Project.objects.values_list("category", flat=True)) <= set(
+        PROJECT_CATEGORIES
+    )
+    assert not Project.objects.filter(description_html="").exists()
+    for project in Project.objects.with_tags():
+        assert [tag.name for tag in project.stack_tags] == parse_stack(project.stack)
+    assert ListingSnapshot.objects.get(category="all").cards
+
+
+@pytest.mark.django_db
+def test_seed_data_inserts_in_bulk(django_assert_max_num_queries):
+    """Test seed_data costs a few queries per batch, not one per project."""
+    with django_assert_max_num_queries(30):
+        call_command("seed_data", count=200, batch_size=100, seed=1, stdout=StringIO())
+
+    assert Project.objects.count() == 203
+
+
+@pytest.mark.django_db
+def test_seed_data_leaves_the_catalogue_ready_to_serve(tmp_path, settings):
+    """Test seeding pre-renders the pages and new projects get fresh ids."""
+    settings.PRERENDER_ROOT = str(tmp_path)
+    call_command("seed_data", count=5, seed=1, stdout=StringIO())
+
+    assert (tmp_path / "projects/index.html").exists()
+    last = Project.objects.order_by("-pk")[0]
+    assert (tmp_path / f"projects/{last.pk}/index.html").exists()
+    project = Project.objects.create(
+        title="After seeding",
+        category="TALK",
+        short_summary="Summary",
+        role="Speaker",
+        year=2024,
+        stack="PYTHON",
+        challenge="Challenge",
+        key_features="Features",
+        description="Description",
+    )
+    assert project.pk == last.pk + 1
+
+
+def test_seed_data_is_reproducible_with_a_seed():
+    """Test the same --seed generates the same catalogue."""
+
+    def generate():
+        projects = synthetic_projects(random.Random(7), 20, {})
+        return [(p.title, p.category, p.year, p.stack) for p in projects]
+
+    assert generate() == generate()
+
+
+# ============================================================================
+# EXPORT / IMPORT TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_export_then_import_restores_projects(tmp_path, create_project, fmt):
+    """Test an export imported into an empty table gives back the projects."""
+    create_project(title='Quotes "and", commas', stack="Python, Go\\Rust")
+    create_project(title="Second", description="Line\n\nbreaks & <tags>")
+    before = list(
+        Project.objects.order_by("uuid").values(
+            "uuid", "title", "stack", "description_html", "image"
+        )
+    )
+    path = tmp_path / f"projects.{fmt}"
+    call_command("export_projects", str(path), stdout=StringIO())
+    Project.objects.all().delete()
+
+    call_command("import_projects", str(path), stdout=StringIO())
+
+    after = Project.objects.order_by("uuid")
+    assert list(after.values(*before[0])) == before
+    for project in after.with_tags():
+        assert [tag.name for tag in project.stack_tags] == parse_stack(project.stack)
+
+
+@pytest.mark.django_db
+def test_import_upserts_on_uuid(tmp_path, web_dev_project):
+    """Test importing updates changed rows in place and leaves others alone."""
+    path = tmp_path / "projects.jsonl"
+    call_command("export_projects", str(path), stdout=StringIO())
+    updated_at = Project.objects.get().updated_at
+
+    out = StringIO()
+    call_command("import_projects", str(path), stdout=out)
+    assert Project.objects.get().updated_at == updated_at
+    assert "0 inserted or changed" in out.getvalue()
+
+    path.write_text(path.read_text().replace("Web Dev Project", "Renamed"))
+    call_command("import_projects", str(path), stdout=StringIO())
+    project = Project.objects.get()
+    assert (project.pk, project.title) == (web_dev_project.pk, "Renamed")
+    assert project.updated_at > updated_at
+
+
+@pytest.mark.django_db
+def test_import_hand_written_csv_fills_derived_columns(tmp_path):
+    """Test a CSV without uuid or HTML gets both, plus tags and snapshots."""
+    path = tmp_path / "projects.csv"
+    path.write_text(
+        "title,category,short_summary,role,year,stack,"
+        "challenge,key_features,description\n"
+        "Imported,TALK,Summary,Speaker,2024,go kafka,Hard,One,Body text\n"
+    )
+
+    call_command("import_projects", str(path), stdout=StringIO())
+
+    project = Project.objects.get()
+    assert project.uuid is not None
+    assert project.description_html == "<p>Body text</p>"
+    assert [tag.name for tag in project.stack_tags] == ["GO", "KAFKA"]
+    assert ListingSnapshot.objects.get(category="TALK").cards[0]["title"] == "Imported"
+
+
+@pytest.mark.django_db
+def test_import_rejects_unknown_columns(tmp_path, web_dev_project):
+    """Test a file with unexpected columns fails without changing anything."""
+    path = tmp_path / "projects.csv"
+    path.write_text("title,owner\nNew,someone\n")
+
+    with pytest.raises(CommandError):
+        call_command("import_projects", str(path), stdout=StringIO())
+    assert list(Project.objects.values_list("title", flat=True)) == ["Web Dev Project"]
+
+
+@pytest.mark.django_db
+def test_import_reports_missing_image_files(tmp_path, web_dev_project):
+    """Test image names without a file in storage are reported."""
+    path = tmp_path / "projects.jsonl"
+    call_command("export_projects", str(path), stdout=StringIO())
+    default_storage.delete(web_dev_project.image.name)
+    Project.objects.all().delete()
+    err = StringIO()
+
+    call_command("import_projects", str(path), stdout=StringIO(), stderr=err)
+
+    assert f"Missing image file: {web_dev_project.image.name}" in err.getvalue()
+
+
+# ============================================================================
+# JSON API TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+def test_api_lists_card_fields_newest_first(
+    client, web_dev_project, sys_design_project, talk_project
+):
+    """Test the list defaults to the card fields, ordered by year."""
+    response = client.get(reverse("api_projects"))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    data = response.json()
+    assert [item["title"] for item in data["results"]] == [
+        "Web Dev Project",
+        "System Design Project",
+        "Tech Talk",
+    ]
+    assert set(data["results"][0]) == {
+        "id",
+        "title",
+        "category",
+        "year",
+        "short_summary",
+        "tags",
+    }
+    assert data["results"][0]["tags"] == ["PYTHON", "DJANGO", "POSTGRESQL"]
+    assert data["next"] is None and data["previous"] is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("query", "titles"),
+    [
+        ({"category": "SYS_DESIGN"}, ["System Design Project"]),
+        ({"year": "2022"}, ["Tech Talk"]),
+        ({"category": "WEB_DEV", "year": "2022"}, []),
+        ({"tag": "django"}, ["Web Dev Project", "System Design Project", "Tech Talk"]),
+    ],
+)
+def test_api_filters_projects(
+    client, web_dev_project, sys_design_project, talk_project, query, titles
+):
+    """Test category, year and tag narrow the list."""
+    response = client.get(reverse("api_projects"), {**query, "fields": "title"})
+
+    assert response.json()["results"] == [{"title": title} for title in titles]
+
+
+@pytest.mark.django_db
+def test_api_selects_only_requested_columns(client, web_dev_project):
+    """Test ?fields= reaches the SELECT list and skips the tag subquery."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("api_projects"), {"fields": "title,category"})
+
+    assert response.json()["results"] == [
+        {"title": "Web Dev Project", "category": "WEB_DEV"}
+    ]
+    (sql,) = [
+        q["sql"] for q in queries.captured_queries if "project_project" in q["sql"]
+    ]
+    select_list = sql.split(" FROM ")[0]
+    assert '"title"' in select_list
+    assert '"description"' not in select_list
+    assert "project_projecttag" not in sql
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    [{"fields": "title,password"}, {"year": "recent"}, {"cursor": "garbage"}],
+)
+def test_api_rejects_bad_queries(client, web_dev_project, query):
+    """Test unknown fields, bad years and bad cursors answer 400 as JSON."""
+    response = client.get(reverse("api_projects"), query)
+
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+@pytest.mark.django_db
+def test_api_cursor_pagination_walks_every_project(client, create_project):
+    """Test following next links returns each project once."""
+    for year in range(2015, 2022):
+        create_project(title=f"Project {year}", year=year)
+
+    titles = []
+    url = reverse("api_projects") + "?fields=title&limit=3"
+    while url:
+        data = client.get(url).json()
+        titles += [item["title"] for item in data["results"]]
+        url = data["next"]
+
+    assert titles == [f"Project {year}" for year in range(2021, 2014, -1)]
+
+
+@pytest.mark.django_db
+def test_api_detail_returns_requested_fields(client, web_dev_project):
+    """Test the detail endpoint honours ?fields= and encodes every type."""
+    url = reverse("api_project_detail", kwargs={"pk": web_dev_project.pk})
+
+    full = client.get(url).json()
+    sparse = client.get(url, {"fields": "uuid,tags"}).json()
+
+    assert set(full) == set(api.FIELDS)
+    assert full["image"] == web_dev_project.image.url
+    assert full["updated_at"] == web_dev_project.updated_at.isoformat()
+    assert sparse == {
+        "uuid": str(web_dev_project.uuid),
+        "tags": ["PYTHON", "DJANGO", "POSTGRESQL"],
+    }
+
+
+@pytest.mark.django_db
+def test_api_detail_of_missing_project_is_404(client):
+    """Test an unknown pk answers 404 as JSON."""
+    response = client.get(reverse("api_project_detail", kwargs={"pk": 999999}))
+
+    assert response.status_code == 404
+    assert response.json() == {"error": "Not found"}
+
+
+async def _stream(async_client, url, query):
+    response = await async_client.get(url, query)
+    return response, [chunk async for chunk in response.streaming_content]
+
+
+@pytest.mark.django_db
+def test_api_export_streams_every_match_in_chunks(
+    settings, async_client, create_project
+):
+    """Test the export is one JSON array, sent API_EXPORT_CHUNK_SIZE rows at a time."""
+    settings.API_EXPORT_CHUNK_SIZE = 2
+    for year in range(2015, 2020):
+        create_project(title=f"Project {year}", year=year)
+
+    response, chunks = async_to_sync(_stream)(
+        async_client, reverse("api_project_export"), {"fields": "title,year"}
+    )
+
+    assert response["Content-Type"] == "application/json"
+    # The opening bracket, three chunks of rows and the closing bracket.
+    assert len(chunks) == 5
+    assert json.loads(b"".join(chunks)) == [
+        {"title": f"Project {year}", "year": year} for year in range(2019, 2014, -1)
+    ]
+
+
+@pytest.mark.django_db
+def test_api_export_of_no_rows_is_an_empty_array(async_client):
+    """Test an export without matches is still valid JSON."""
+    _response, chunks = async_to_sync(_stream)(
+        async_client, reverse("api_project_export"), {"category": "TALK"}
+    )
+
+    assert json.loads(b"".join(chunks)) == []
+
+
+# ============================================================================
+# PRE-RENDER TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+def test_prerender_writes_every_public_page(
+    tmp_path, web_dev_project, sys_design_project
+):
+    """Test home, each listing variant and each detail page get a file."""
+    call_command("prerender", output=str(tmp_path), stdout=StringIO())
+
+    assert "GOLANG" in (tmp_path / "index.html").read_text()
+    listing = (tmp_path / "projects/category/WEB_DEV/index.html").read_text()
+    assert "Web Dev Project" in listing
+    assert "System Design Project" not in listing
+    assert "System Design Project" in (tmp_path / "projects/index.html").read_text()
+    detail = tmp_path / f"projects/{sys_design_project.pk}/index.html"
+    assert "System Design Project" in detail.read_text()
+
+
+@pytest.mark.django_db
+def test_prerender_only_renders_pages_whose_version_changed(
+    tmp_path, web_dev_project, sys_design_project, django_capture_on_commit_callbacks
+):
+    """Test a second run renders what a write changed and skips the rest."""
+    async_to_sync(prerender_site)(tmp_path)
+    untouched = tmp_path / f"projects/{sys_design_project.pk}/index.html"
+    written = untouched.stat().st_mtime_ns
+
+    web_dev_project.title = "Renamed"
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.save()
+    result = async_to_sync(prerender_site)(tmp_path)
+
+    # Home and the untouched detail page; the listing snapshots all moved.
+    assert result.skipped == 2
+    assert result.rendered == 1 + len(PROJECT_CATEGORIES) + 2
+    assert untouched.stat().st_mtime_ns == written
+    detail = tmp_path / f"projects/{web_dev_project.pk}/index.html"
+    assert "Renamed" in detail.read_text()
+
+
+@pytest.mark.django_db
+def test_project_write_rerenders_its_pages(
+    settings, tmp_path, web_dev_project, django_capture_on_commit_callbacks
+):
+    """Test a save rewrites the project's pages and a delete removes its own."""
+    settings.PRERENDER_ROOT = str(tmp_path)
+    detail = tmp_path / f"projects/{web_dev_project.pk}/index.html"
+
+    web_dev_project.title = "Renamed"
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.save()
+    assert "Renamed" in detail.read_text()
+    assert "Renamed" in (tmp_path / "projects/index.html").read_text()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        web_dev_project.delete()
+    assert not detail.exists()
+    assert "Renamed" not in (tmp_path / "projects/index.html").read_text()
+
+
+def test_prerender_needs_an_output_directory(settings):
+    """Test the command refuses to run without a directory."""
+    settings.PRERENDER_ROOT = ""
+
+    with pytest.raises(CommandError):
+        call_command("prerender", stdout=StringIO())
+
+
+# ============================================================================
+# STATIC ASSET TESTS
+# ============================================================================
+
+
+def test_purge_css_drops_rules_for_unused_classes():
+    """Test only selectors whose classes are all used survive the purge."""
+    css = (
+        "/*! notice */@layer base,utilities;*{margin:0}"
+        ".used{color:red}.unused{color:blue}.used,.unused:hover{top:0}"
+        "@media (min-width:40rem){.unused{left:0}}"
+        ":where(.used>:not(.other)){gap:0}"
+    )
+
+    purged = purge_css(css, {"used"})
+
+    assert purged == (
+        "/*! notice */@layer base,utilities;*{margin:0}"
+        ".used{color:red}.used{top:0}"
+        ":where(.used>:not(.other)){gap:0}"
+    )
+
+
+def test_purge_css_reads_escaped_class_names():
+    """Test Tailwind's escaped variant and fraction classes match their names."""
+    css = ".hover\\:bg-pop:hover{color:red}.py-0\\.5{padding:0}.w-\\[1px\\]{width:1px}"
+
+    purged = purge_css(css, {"hover:bg-pop", "w-[1px]"})
+
+    assert purged == ".hover\\:bg-pop:hover{color:red}.w-\\[1px\\]{width:1px}"
+
+
+def test_minify_css_keeps_strings_and_notices():
+    """Test whitespace and comments go but string contents and /*! stay."""
+    css = """
+    /*! License */
+    /* dropped */
+    a > b ,  .c :hover {
+        content: "  {;}  ";
+        margin: 0 auto;
+    }
+    """
+
+    minified = minify_css(css)
+
+    assert minified == '/*! License */a>b,.c :hover{content:"  {;}  ";margin:0 auto}'
+
+
+def test_collectstatic_serves_hashed_precompressed_assets(settings, tmp_path, client):
+    """Test assets get hashed names and .br/.gz copies served as immutable."""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "core.assets.OptimizedStaticFilesStorage"},
+    }
+    settings.STATIC_ROOT = tmp_path
+    call_command(
+        "collectstatic", interactive=False, verbosity=0, ignore_patterns=["admin"]
+    )
+
+    manifest = json.loads((tmp_path / "staticfiles.json").read_text())
+    hashed = manifest["paths"]["css/tailwind.css"]
+    assert hashed != "css/tailwind.css"
+    assert (tmp_path / f"{hashed}.br").exists()
+    assert (tmp_path / f"{hashed}.gz").exists()
+    assert "\n" not in (tmp_path / hashed).read_text()
+
+    response = client.get(f"/static/{hashed}", headers={"accept-encoding": "br"})
+
+    assert response["Content-Encoding"] == "br"
+    assert "immutable" in response["Cache-Control"]
+
+
+# ============================================================================
+# QUERY PLAN TESTS
+# ============================================================================
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "category,index",
+    [
+        ("all", "project_year_id"),
+        ("WEB_DEV", "project_category_year_id"),
+    ],
+)
+def test_listing_pages_use_index_scans(large_catalogue, category, index):
+    """Test first and later listing pages are index range scans."""
+    projects = Project.objects.for_category(category)
+    first_page, _ = page_queryset(projects, None, 12)
+    # A cursor deep in the catalogue, where a scan from the top would hurt.
+    boundary = projects.filter(year=2012).order_by("-id")[100]
+    later_page, _ = page_queryset(projects, encode_cursor(boundary, NEXT), 12)
+    earlier_page, _ = page_queryset(projects, encode_cursor(boundary, PREVIOUS), 12)
+
+    for queryset in (first_page, later_page, earlier_page):
+        plan = queryset.explain()
+        assert index in plan
+        assert "Seq Scan" not in plan
+        assert "Sort" not in plan
+
+
+@pytest.mark.django_db
+def test_tag_listing_pages_walk_the_tag_index(large_catalogue):
+    """Test tag pages read the tag's index slice in order instead of sorting."""
+    projects = Project.objects.for_category("WEB_DEV").with_tag("python")
+    boundary = Project.objects.filter(year=2012).order_by("-id")[100]
+    pages = [
+        page_queryset(projects, cursor, 12)[0]
+        for cursor in (
+            None,
+            encode_cursor(boundary, NEXT),
+            encode_cursor(boundary, PREVIOUS),
+        )
+    ]
+
+    for queryset in pages:
+        plan = queryset.explain()
+        assert "project_tag_tag_year" in plan
+        # The tag lookup itself may scan the handful of rows in project_tag.
+        assert "Seq Scan on project_project" not in plan
+        assert "Sort" not in plan
+
+
+@pytest.mark.django_db
+def test_later_listing_page_seeks_with_index_condition(large_catalogue):
+    """Test a cursor page seeks into the index instead of filtering from the top."""
+    projects = Project.objects.for_category("SYS_DESIGN")
+    cursor = encode_cursor(Project(pk=10_000_000, year=2010), NEXT)
+    page, _ = page_queryset(projects, cursor, 12)
+
+    plan = page.explain()
+
+    assert (
+        "Index Cond: (((category)::text = 'SYS_DESIGN'::text) AND (year <= 2010))"
+        in plan
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "queryset_factory",
+    [
+        lambda: Project.objects.featured(),
+        lambda: Project.objects.filter(pk=1234),
+        lambda: Project.objects.filter(year=2020),
+    ],
+)
+def test_point_lookups_use_index_scans(large_catalogue, queryset_factory):
+    """Test featured, detail and admin year lookups avoid sequential scans."""
+    plan = queryset_factory().explain()
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.django_db
+def test_default_ordering_is_newest_first(create_project):
+    """Test unordered queries come back in a deterministic order."""
+    older = create_project(year=2020)
+    newer = create_project(year=2024)
+    same_year = create_project(year=2024)
+    assert list(Project.objects.all()) == [same_year, newer, older]
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.html import linebreaks
+
+from .models import Project
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+# Long-form fields only the detail page shows; each has a ``<name>_html``
+# column holding its rendered form.
+TEXT_FIELDS = ("challenge", "key_features", "description")
+
+
+def render_text(text: str) -> str:
+    if settings.PROJECT_TEXT_FORMAT == "markdown":
+        if markdown is None:
+            raise ImproperlyConfigured(
+                "PROJECT_TEXT_FORMAT=markdown needs the markdown package"
+            )
+        # Content comes from the admin only, so raw HTML in it is trusted.
+        return markdown.markdown(text)
+    return linebreaks(text, autoescape=True)
+
+
+def render_project_text(project: Project) -> list[str]:
+    """Refresh the ``*_html`` columns of ``project`` in memory.
+
+    Returns the names of the columns that changed.
+    """
+    changed = []
+    for field in TEXT_FIELDS:
+        html = render_text(getattr(project, field))
+        if getattr(project, f"{field}_html") != html:
+            setattr(project, f"{field}_html", html)
+            changed.append(f"{field}_html")
+    return changed
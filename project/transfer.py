@@ -0,0 +1,235 @@
+"""Move projects between databases as JSONL or CSV files, through COPY.
+
+Both directions stream in chunks. Export copies a query straight into the
+file. Import copies the file into a temporary table, then upserts from
+there on ``Project.uuid``. Rows never go through the ORM one by one.
+"""
+
+import csv
+from dataclasses import dataclass, field
+from itertools import batched
+from pathlib import Path
+from typing import IO
+
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .listing import rebuild_listing_snapshots
+from .models import Project, ProjectTag, Tag
+from .text import TEXT_FIELDS, render_project_text
+
+FORMATS = ("jsonl", "csv")
+
+# ``id`` differs between databases and ``updated_at`` and ``search_vector``
+# are set by the target, so none of them travel.
+SOURCE_COLUMNS = (
+    "uuid",
+    "title",
+    "category",
+    "short_summary",
+    "role",
+    "year",
+    "stack",
+    "repository",
+    "featured",
+    "featured_order",
+    *TEXT_FIELDS,
+    "image",
+)
+HTML_COLUMNS = tuple(f"{name}_html" for name in TEXT_FIELDS)
+COLUMNS = (*SOURCE_COLUMNS, *HTML_COLUMNS, "image_variants")
+
+# Optional in a file, as is image_variants; everything else must be present
+# on every row.
+_DEFAULTS = {
+    "uuid": "gen_random_uuid()",
+    "repository": "''",
+    "featured": "false",
+    "featured_order": "0",
+    **{column: "''" for column in HTML_COLUMNS},
+    "image": "''",
+}
+
+# CSV mode with quote and delimiter bytes JSON never contains unescaped, so
+# each JSON document passes through COPY as one untouched line.
+_JSONL_COPY = "FORMAT csv, QUOTE e'\\x01', DELIMITER e'\\x02'"
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(slots=True)
+class ImportResult:
+    read: int = 0
+    # Inserted, or updated because a source column differed.
+    changed: int = 0
+    # Image names the file refers to that are not in MEDIA storage yet.
+    missing_images: list[str] = field(default_factory=list)
+
+
+def file_format(path: str) -> str:
+    """The format named by ``path``'s extension, or jsonl."""
+    suffix = Path(path).suffix.lstrip(".").lower()
+    return suffix if suffix in FORMATS else "jsonl"
+
+
+def export_projects(out: IO[bytes], fmt: str) -> int:
+    """Write every project to ``out``; returns how many were written."""
+    query = f"SELECT {', '.join(COLUMNS)} FROM {Project._meta.db_table} ORDER BY id"
+    if fmt == "csv":
+        sql = f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)"
+    else:
+        sql = f"COPY (SELECT row_to_json(p) FROM ({query}) p) TO STDOUT WITH ({_JSONL_COPY})"
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for chunk in copy:
+                out.write(chunk)
+        return cursor.rowcount
+
+
+def import_projects(source: IO[bytes], fmt: str) -> ImportResult:
+    """Upsert the projects in ``source`` on ``uuid``.
+
+    Rows whose source columns all match are left alone, so their
+    ``updated_at`` and cached pages survive a repeated import. Stored HTML
+    is kept when the file has it and rendered otherwise; image variants are
+    kept only if they were built from the row's image.
+    """
+    result = ImportResult()
+    table = Project._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE import_project AS"
+            f" SELECT {', '.join(COLUMNS)} FROM {table} WITH NO DATA"
+        )
+        if fmt == "csv":
+            header = next(csv.reader([source.readline().decode()]))
+            if unknown := set(header) - set(COLUMNS):
+                raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+            _copy_in(
+                cursor,
+                f"COPY import_project ({', '.join(header)}) FROM STDIN WITH (FORMAT csv)",
+                source,
+            )
+        else:
+            cursor.execute("CREATE TEMP TABLE import_line (doc jsonb)")
+            _copy_in(
+                cursor, f"COPY import_line FROM STDIN WITH ({_JSONL_COPY})", source
+            )
+            cursor.execute(
+                "INSERT INTO import_project SELECT row.* FROM import_line,"
+                " jsonb_populate_record(NULL::import_project, doc) AS row"
+            )
+        cursor.execute("SELECT count(*) FROM import_project")
+        result.read = cursor.fetchone()[0]
+
+        # Fill what the file left out, and drop variants that were not
+        # built from the row's image.
+        defaults = ", ".join(
+            f"{column} = COALESCE({column}, {default})"
+            for column, default in _DEFAULTS.items()
+        )
+        cursor.execute(
+            f"UPDATE import_project SET {defaults}, image_variants = CASE"
+            " WHEN image_variants->>'source' = COALESCE(image, '')"
+            " THEN image_variants ELSE '{}'::jsonb END"
+        )
+        cursor.execute("ANALYZE import_project")
+
+        # An update and an insert rather than INSERT ... ON CONFLICT, which
+        # computes search_vector for every row before finding the conflict.
+        columns = ", ".join(COLUMNS)
+        assignments = ", ".join(f"{column} = i.{column}" for column in COLUMNS)
+        current = ", ".join(f"p.{column}" for column in SOURCE_COLUMNS)
+        incoming = ", ".join(f"i.{column}" for column in SOURCE_COLUMNS)
+        cursor.execute(
+            f"""
+            CREATE TEMP TABLE import_changed AS
+            WITH updated AS (
+                UPDATE {table} p SET {assignments}, updated_at = now()
+                FROM import_project i
+                WHERE p.uuid = i.uuid AND ({current}) IS DISTINCT FROM ({incoming})
+                RETURNING p.id
+            ), inserted AS (
+                INSERT INTO {table} ({columns}, updated_at)
+                SELECT {columns}, now() FROM import_project i
+                WHERE NOT EXISTS (SELECT FROM {table} p WHERE p.uuid = i.uuid)
+                RETURNING id
+            )
+            SELECT id FROM updated UNION ALL SELECT id FROM inserted
+            """
+        )
+        result.changed = cursor.rowcount
+        _sync_tags(cursor)
+
+        changed = Project.objects.filter(
+            id__in=RawSQL("SELECT id FROM import_changed", [])
+        )
+        _render_missing_html(changed)
+        result.missing_images = [
+            name
+            for name in changed.exclude(image="")
+            .order_by()
+            .values_list("image", flat=True)
+            .distinct()
+            .iterator()
+            if not default_storage.exists(name)
+        ]
+        # Dropped here rather than ON COMMIT, so the import also works inside
+        # a caller's transaction.
+        cursor.execute(
+            "DROP TABLE IF EXISTS import_line, import_project, import_changed"
+        )
+        rebuild_listing_snapshots()
+    return result
+
+
+def _copy_in(cursor, sql: str, source: IO[bytes]) -> None:
+    with cursor.copy(sql) as copy:
+        while chunk := source.read(CHUNK_SIZE):
+            copy.write(chunk)
+
+
+def _sync_tags(cursor) -> None:
+    # Project.sync_tags in SQL, for every changed row at once: split on
+    # whitespace and commas, upper-case, keep the first position of each.
+    tag_table = Tag._meta.db_table
+    project_tag_table = ProjectTag._meta.db_table
+    tokens = f"""
+        SELECT p.id, p.year, upper(token.name) AS name, min(token.ord) AS ord
+        FROM {Project._meta.db_table} p
+        JOIN import_changed USING (id),
+        unnest(regexp_split_to_array(p.stack, '[\\s,]+'))
+            WITH ORDINALITY AS token(name, ord)
+        WHERE token.name <> ''
+        GROUP BY p.id, p.year, upper(token.name)
+    """
+    cursor.execute(
+        f"INSERT INTO {tag_table} (name) SELECT DISTINCT name FROM ({tokens}) t"
+        " ON CONFLICT (name) DO NOTHING"
+    )
+    cursor.execute(
+        f"DELETE FROM {project_tag_table}"
+        " WHERE project_id IN (SELECT id FROM import_changed)"
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO {project_tag_table} (project_id, tag_id, position, year)
+        SELECT t.id, tag.id, row_number() OVER (PARTITION BY t.id ORDER BY t.ord) - 1,
+            t.year
+        FROM ({tokens}) t JOIN {tag_table} tag ON tag.name = t.name
+        """
+    )
+
+
+def _render_missing_html(projects) -> None:
+    # Exports carry the HTML; only files written by hand need rendering.
+    missing = Q()
+    for name in TEXT_FIELDS:
+        missing |= Q(**{f"{name}_html": ""}) & ~Q(**{name: ""})
+    rows = projects.filter(missing).only("pk", *TEXT_FIELDS, *HTML_COLUMNS)
+    for batch in batched(rows.iterator(), 500):
+        for project in batch:
+            render_project_text(project)
+        Project.objects.bulk_update(batch, HTML_COLUMNS)
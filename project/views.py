@@ -1,12 +1,40 @@
-import json
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.shortcuts import aget_object_or_404, render
 
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import get_object_or_404, render
+from .cache import (
+    cache_page_view,
+    home_cache_key,
+    project_detail_cache_key,
+    project_list_cache_key,
+)
+from .conditional import (
+    condition,
+    home_etag,
+    project_detail_etag,
+    project_detail_last_modified,
+    project_list_etag,
+)
+from .listing import (
+    ProjectCard,
+    featured_projects,
+    is_grid_fragment,
+    listing_page,
+    listing_snapshot,
+    projects_json,
+    snapshot_cards,
+    snapshot_category,
+    snapshot_json,
+)
+from .models import PROJECT_CATEGORIES, Project, normalize_tag
+from .pagination import InvalidCursor
+from .search import highlight, ranked_search
+from .text import TEXT_FIELDS
 
-from .models import PROJECT_CATEGORIES, Project
 
-
-def home(request: HttpRequest) -> HttpResponse:
+@cache_page_view("home", home_cache_key)
+@condition(etag_func=home_etag)
+async def home(request: HttpRequest) -> HttpResponse:
     tech_stack = [
         "GOLANG",
         "PYTHON",
@@ -17,51 +45,76 @@ def home(request: HttpRequest) -> HttpResponse:
         "CI/CD",
         "PHP",
     ]
-    featured_projects = Project.objects.filter(id__in=[1, 2])
+    featured = await featured_projects()
 
     context = {
         "tech_stack": tech_stack,
-        "featured_projects": featured_projects,
+        "featured_projects": featured.cards,
     }
     return render(request, "pages/home.html", context)
 
 
-def project_list(request: HttpRequest) -> HttpResponse:
+@cache_page_view("project_list", project_list_cache_key)
+@condition(etag_func=project_list_etag)
+async def project_list(request: HttpRequest) -> HttpResponse:
     category_filter = request.GET.get("category")
-    if category_filter and category_filter != "all":
-        projects = Project.objects.filter(category=category_filter)
+    tag_filter = request.GET.get("tag")
+    if category := snapshot_category(request):
+        snapshot = await listing_snapshot(request, category)
+        projects = snapshot_cards(snapshot)
+        data = snapshot_json(snapshot)
+        next_cursor, previous_cursor = snapshot.next_cursor or None, None
     else:
-        projects = Project.objects.all()
-
-    # Get all unique categories from all projects, regardless of current filter
-
-    projects_data = []
-    for project in projects:
-        projects_data.append(
-            {
-                "id": project.id,
-                "title": project.title,
-                "category": project.category,
-                "year": project.year,
-                "short_summary": project.short_summary,
-                "tags": project.stack.split(),
-            }
-        )
+        try:
+            page = await listing_page(request)
+        except InvalidCursor:
+            raise Http404("Invalid page cursor")
+        projects = [ProjectCard.from_row(row) for row in page.items]
+        data = projects_json(projects)
+        next_cursor, previous_cursor = page.next_cursor, page.previous_cursor
 
     context = {
         "projects": projects,
-        "projects_json": json.dumps(projects_data),
-        "categories": PROJECT_CATEGORIES,
         "current_filter": category_filter or "all",
+        "current_tag": normalize_tag(tag_filter) if tag_filter else None,
+        "next_cursor": next_cursor,
+        "previous_cursor": previous_cursor,
     }
-    Project.objects.all()
+    if is_grid_fragment(request):
+        # Swapped into a page that already has the layout and filters.
+        return render(request, "components/project_grid.html", context)
+    context["projects_json"] = data
+    context["categories"] = PROJECT_CATEGORIES
     return render(request, "pages/projects.html", context)
 
 
-def project_detail(request: HttpRequest, pk: int) -> HttpResponse:
-    project = get_object_or_404(Project, pk=pk)
+@cache_page_view("project_detail", project_detail_cache_key)
+@condition(
+    etag_func=project_detail_etag, last_modified_func=project_detail_last_modified
+)
+async def project_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    # The template only emits the pre-rendered *_html columns.
+    project = await aget_object_or_404(
+        Project.objects.with_tags().defer(*TEXT_FIELDS, "search_vector"), pk=pk
+    )
 
     context = {
         "project": project,
     }
     return render(request, "pages/project_detail.html", context)
+
+
+async def project_search(request: HttpRequest) -> HttpResponse:
+    query = request.GET.get("q", "").strip()
+    results = []
+    if query:
+        matches = ranked_search(Project.objects.all(), query)
+        results = [p async for p in matches[: settings.SEARCH_RESULTS_LIMIT]]
+        for project in results:
+            project.snippet = highlight(project.headline)
+
+    context = {
+        "query": query,
+        "results": results,
+    }
+    return render(request, "pages/search.html", context)